@@ -0,0 +1,18 @@
+"""
+Delete generated files that are no longer needed.
+
+Run periodically (e.g. from cron): python cleanup_orphaned_files.py
+"""
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+django.setup()
+
+from core.tasks.pdf_rendering import cleanup_generated_pdfs  # noqa: E402
+
+
+if __name__ == "__main__":
+	deleted = cleanup_generated_pdfs()
+	print(f"Deleted {deleted} expired generated PDF(s)")
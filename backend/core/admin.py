@@ -1,16 +1,73 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.utils import timezone
 from .models import Project, Contractor, RenovationPlan
 from .models import Project, Contractor, ContractingPlanning, ContractingPlanningFile, Message, MessageAction, MessageAttachment, RenovationPlan
 from .models import ChatSession
 from .models import ChatMessage
 from .models import UserMemory
 
+
+class ProjectedChangeList(ChangeList):
+	"""
+	Changelist that loads only the model admin's ``list_only`` columns
+	"""
+	def get_queryset(self, request, *args, **kwargs):
+		queryset = super().get_queryset(request, *args, **kwargs)
+		if self.model_admin.list_only:
+			queryset = queryset.only(*self.model_admin.list_only)
+		return queryset
+
+
+class ListOnlyMixin:
+	"""
+	Restrict changelist rows to the columns that are actually displayed.
+
+	``list_only`` lists the fields to load (use ``fk__field`` for columns
+	joined through ``list_select_related``). The change form is unaffected
+	and still loads the full object.
+	"""
+	list_only = ()
+
+	def get_changelist(self, request, **kwargs):
+		return ProjectedChangeList
+
+
+def iter_id_batches(queryset, batch_size=500):
+	"""
+	Yield lists of primary keys from ``queryset``, streamed from the database
+	so bulk actions never hold every selected row in memory
+	"""
+	batch = []
+	for pk in queryset.values_list("id", flat=True).iterator(chunk_size=2000):
+		batch.append(pk)
+		if len(batch) == batch_size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+
+class BatchedDeleteMixin:
+	"""
+	Make the built-in "Delete selected" action delete in id batches.
+
+	The action keeps its delete permission check and confirmation page;
+	only the final delete is split so large selections never run as one
+	statement over every selected row.
+	"""
+	def delete_queryset(self, request, queryset):
+		for batch in iter_id_batches(queryset):
+			self.model.objects.filter(id__in=batch).delete()
+
+
 @admin.register(UserMemory)
 class UserMemoryAdmin(admin.ModelAdmin):
     list_display = ['id', 'user', 'memory_type', 'key', 'short_value', 'confidence', 'is_active', 'updated_at']
     list_filter = ['memory_type', 'is_active', 'created_at']
     search_fields = ['user__username', 'key', 'value']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['user']
     
     def short_value(self, obj):
         return obj.value[:40] + "..." if len(obj.value) > 40 else obj.value
@@ -20,41 +77,56 @@ class ProjectAdmin(admin.ModelAdmin):
 	list_display = ("id", "name")
 
 @admin.register(ChatMessage)
-class ChatMessageAdmin(admin.ModelAdmin):
+class ChatMessageAdmin(ListOnlyMixin, admin.ModelAdmin):
     list_display = ['id', 'session', 'role', 'short_content', 'created_at']
     list_filter = ['role', 'created_at']
     search_fields = ['content']
     readonly_fields = ['created_at']
+    list_select_related = ['session', 'session__user']
+    list_only = ['id', 'session__title', 'session__created_at', 'session__user__username', 'role', 'content', 'created_at']
+    list_per_page = 50
+    show_full_result_count = False
     
     def short_content(self, obj):
         return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
     short_content.short_description = "Content"
 @admin.register(ChatSession)
-class ChatSessionAdmin(admin.ModelAdmin):
+class ChatSessionAdmin(ListOnlyMixin, admin.ModelAdmin):
     list_display = ['id', 'user', 'title', 'session_type', 'is_active', 'is_plan_generated', 'created_at']
     list_filter = ['session_type', 'is_active', 'is_plan_generated']
     search_fields = ['user__username', 'title']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['user']
+    list_only = ['id', 'user__username', 'title', 'session_type', 'is_active', 'is_plan_generated', 'created_at', 'updated_at']
 
 @admin.register(Contractor)
-class ContractorAdmin(admin.ModelAdmin):
+class ContractorAdmin(ListOnlyMixin, admin.ModelAdmin):
 	list_display = ("id", "name", "city", "state", "rating")
 	list_filter = ("kfw_eligible", "state")
 	search_fields = ("name", "city", "email", "project_types")
+	list_only = ("id", "name", "city", "state", "rating")
 
 
 class ContractingPlanningFileInline(admin.TabularInline):
 	model = ContractingPlanningFile
 	extra = 0
+	fields = ('file', 'filename', 'uploaded_at')
 	readonly_fields = ('uploaded_at',)
 
+	def get_queryset(self, request):
+		# Each inline row renders the file's __str__, which walks
+		# contracting_planning -> project; join them once for the whole formset.
+		return super().get_queryset(request).select_related("contracting_planning__project")
+
 
 @admin.register(ContractingPlanning)
-class ContractingPlanningAdmin(admin.ModelAdmin):
+class ContractingPlanningAdmin(ListOnlyMixin, admin.ModelAdmin):
 	list_display = ("id", "project", "current_step", "created_at", "updated_at")
 	list_filter = ("current_step", "created_at", "updated_at")
 	search_fields = ("project__name", "description")
 	readonly_fields = ("created_at", "updated_at")
+	list_select_related = ("project",)
+	list_only = ("id", "project__name", "current_step", "created_at", "updated_at")
 	inlines = [ContractingPlanningFileInline]
 
 
@@ -64,39 +136,66 @@ class ContractingPlanningFileAdmin(admin.ModelAdmin):
 	list_filter = ("uploaded_at",)
 	search_fields = ("filename", "contracting_planning__project__name")
 	readonly_fields = ("uploaded_at",)
+	list_select_related = ("contracting_planning__project",)
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(BatchedDeleteMixin, ListOnlyMixin, admin.ModelAdmin):
 	list_display = ("id", "contracting_planning", "contractor_id", "sender", "message_type", "timestamp")
 	list_filter = ("sender", "message_type", "timestamp")
-	search_fields = ("content", "contracting_planning__project__name")
+	# Exact/prefix lookups only: '%term%' scans over message bodies do not scale
+	search_fields = ("=contractor_id", "^contracting_planning__project__name")
+	search_help_text = "Search by exact contractor ID or project name prefix"
 	readonly_fields = ("timestamp",)
 	ordering = ("-timestamp",)
+	list_select_related = ("contracting_planning__project",)
+	list_only = ("id", "contracting_planning__project__name", "contractor_id", "sender", "message_type", "timestamp")
+	list_per_page = 50
+	show_full_result_count = False
+	actions = ["mark_as_read"]
+
+	@admin.action(permissions=["change"], description="Mark selected as read")
+	def mark_as_read(self, request, queryset):
+		updated = 0
+		now = timezone.now()
+		for batch in iter_id_batches(queryset):
+			updated += Message.objects.filter(id__in=batch, is_read=False).update(is_read=True, read_at=now)
+		self.message_user(request, f"Marked {updated} messages as read.")
 
 
 @admin.register(MessageAction)
-class MessageActionAdmin(admin.ModelAdmin):
+class MessageActionAdmin(ListOnlyMixin, admin.ModelAdmin):
 	list_display = ("id", "message", "action_type", "action_status", "created_at", "updated_at")
 	list_filter = ("action_type", "action_status", "created_at")
 	search_fields = ("action_summary",)
 	readonly_fields = ("created_at", "updated_at")
 	ordering = ("-created_at",)
+	list_select_related = ("message",)
+	list_only = (
+		"id", "message__sender", "message__contractor_id", "message__timestamp",
+		"action_type", "action_status", "created_at", "updated_at",
+	)
 
 
 @admin.register(MessageAttachment)
-class MessageAttachmentAdmin(admin.ModelAdmin):
+class MessageAttachmentAdmin(BatchedDeleteMixin, ListOnlyMixin, admin.ModelAdmin):
 	list_display = ("id", "message", "filename", "content_type", "file_size", "uploaded_at")
 	list_filter = ("content_type", "uploaded_at")
-	search_fields = ("filename", "message__content")
+	search_fields = ("^filename",)
+	search_help_text = "Search by filename prefix"
 	readonly_fields = ("uploaded_at",)
 	ordering = ("-uploaded_at",)
+	list_select_related = ("message",)
+	list_only = (
+		"id", "message__sender", "message__contractor_id", "message__timestamp",
+		"filename", "content_type", "file_size", "uploaded_at",
+	)
 
 
 @admin.register(RenovationPlan)
-class RenovationPlanAdmin(admin.ModelAdmin):
+class RenovationPlanAdmin(ListOnlyMixin, admin.ModelAdmin):
     list_display = ['id', 'plan_name', 'user', 'status', 'created_at']
     list_filter = ['status', 'created_at']
     readonly_fields = ['created_at', 'updated_at']
-
-
+    list_select_related = ['user']
+    list_only = ['id', 'plan_name', 'user__username', 'status', 'created_at']
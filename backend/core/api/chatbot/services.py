@@ -1,86 +1,31 @@
+import io
+import re
 import uuid
+from functools import lru_cache
 import google.generativeai as genai
+import orjson
+from PIL import Image
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from core.models import ChatSession, ChatMessage, UserMemory, SessionType, MessageRole, MemoryType
+from core.services.request_hedging import hedged_call
 
+# Longest edge (px) of images sent to Gemini; larger uploads are downscaled
+MAX_IMAGE_SIDE = 1600
 
-class ChatbotService:
-    def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+CHAT_MODEL = 'gemini-2.5-flash'
+# Plan extraction is structured output, not reasoning; a lighter model is enough
+EXTRACTION_MODEL = 'gemini-2.0-flash'
 
-    def get_or_create_session(self, user, session_id=None, project=None):
-        """
-        Get existing session or create new one for user.
-        """
-        if session_id:
-            try:
-                session = ChatSession.objects.get(id=session_id, user=user)
-                return session
-            except ChatSession.DoesNotExist:
-                pass
-        
-        # Create new session
-        session = ChatSession.objects.create(
-            user=user,
-            project=project,
-            session_type=SessionType.PLANNING,
-            title="New Renovation Chat"
-        )
-        return session
+# Per-session history mirrored in the cache, validated against session.updated_at
+SESSION_STATE_TIMEOUT = 86400
 
-    def get_conversation_history(self, session):
-        """
-        Retrieve conversation history from database.
-        """
-        messages = ChatMessage.objects.filter(session=session).order_by('created_at')
-        history = []
-        for msg in messages:
-            history.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        return history
+# Outermost {...} span of a model reply, ignoring code fences and chatter around it
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
 
-    def save_message(self, session, role, content, metadata=None):
-        """
-        Save a single message to database.
-        """
-        return ChatMessage.objects.create(
-            session=session,
-            role=role,
-            content=content,
-            metadata=metadata or {}
-        )
 
-    def get_user_memories(self, user):
-        """
-        Retrieve active memories for user to include in context.
-        """
-        memories = UserMemory.objects.filter(user=user, is_active=True)
-        if not memories.exists():
-            return ""
-        
-        memory_text = "## Known Information About User:\n"
-        for mem in memories:
-            memory_text += f"- {mem.key}: {mem.value}\n"
-        return memory_text
-
-    def generate_response(self, message, user, session_id=None, project=None, image=None):
-        """
-        Generate AI response for user message.
-        Now uses database instead of cache.
-        """
-        # Get or create session
-        session = self.get_or_create_session(user, session_id, project)
-        
-        # Get conversation history
-        history = self.get_conversation_history(session)
-        
-        # Get user memories for context
-        user_memories = self.get_user_memories(user)
-        
-        system_prompt = """You are a friendly renovation planning assistant for buildings in Germany. Your goal is to have a natural conversation to understand what the user wants to renovate and gather enough details to create a useful renovation plan.
+_SYSTEM_PROMPT = """You are a friendly renovation planning assistant for buildings in Germany. Your goal is to have a natural conversation to understand what the user wants to renovate and gather enough details to create a useful renovation plan.
 
 ## YOUR APPROACH:
 - Be conversational and natural, not like a form or checklist
@@ -131,13 +76,159 @@ When you feel you understand their project well enough (usually after 4-8 exchan
 
 DO NOT generate the plan yourself. DO NOT offer to create it. Just confirm the details and direct them to the button."""
 
+
+_EXTRACTION_TEMPLATE = """Analyze this conversation and extract ALL renovation-related information the user provided.
+
+Conversation:
+{conversation_text}
+
+Extract and return a JSON object with these fields (use null for missing info):
+{{
+    "building_type": "apartment/house/commercial/other",
+    "building_age": "year or decade",
+    "building_size": "square meters as number",
+    "location": "city or Bundesland",
+    "budget": "number in euros",
+    "renovation_goals": ["list", "of", "goals"],
+    "specific_materials": ["any specific materials mentioned"],
+    "rooms_involved": ["list of rooms"],
+    "current_condition": "description",
+    "timeline": "when they want to start/finish",
+    "special_requirements": ["any special needs mentioned"],
+    "heating_system": "if mentioned",
+    "energy_goals": "if mentioned"
+}}
+
+Return ONLY valid JSON, no other text."""
+
+
+@lru_cache(maxsize=None)
+def _get_model(model_name):
+    """
+    Build the Gemini model once per process and reuse it across requests.
+    """
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+
+def prepare_image_part(image):
+    """
+    Build the Gemini image part for an uploaded image.
+    The image is downscaled and re-encoded as JPEG so only a small payload
+    is held in memory and sent upstream. Uploads Pillow cannot decode are
+    passed through unchanged.
+    """
+    try:
+        img = Image.open(image)
+        img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=85, optimize=True)
+        return {"mime_type": "image/jpeg", "data": buffer.getvalue()}
+    except OSError:
+        image.seek(0)
+        return {"mime_type": image.content_type, "data": image.read()}
+
+
+def extract_json_object(text):
+    """
+    Parse the JSON object embedded in a model reply.
+    Tolerates ```json fences and any text before or after the object.
+    Raises ValueError if no valid object is found.
+    """
+    match = _JSON_OBJECT_RE.search(text)
+    if not match:
+        raise ValueError("No JSON object found in model response")
+    return orjson.loads(match.group(0))
+
+
+class ChatbotService:
+    def __init__(self):
+        self.model = _get_model(CHAT_MODEL)
+        self.extraction_model = _get_model(EXTRACTION_MODEL)
+
+    def get_or_create_session(self, user, session_id=None, project=None):
+        """
+        Get existing session or create new one for user.
+        """
+        if session_id:
+            session = ChatSession.objects.filter(id=session_id, user=user).first()
+            if session is not None:
+                return session
+        
+        # Create new session
+        session = ChatSession.objects.create(
+            user=user,
+            project=project,
+            session_type=SessionType.PLANNING,
+            title="New Renovation Chat"
+        )
+        return session
+
+    def get_session_state_key(self, session_id):
+        return f"chatsess:{session_id}:state"
+
+    def get_conversation_history(self, session):
+        """
+        Retrieve conversation history, from the cache when it is still current
+        for this session and from the database otherwise.
+        """
+        cache_key = self.get_session_state_key(session.id)
+        state = cache.get(cache_key)
+        if state and state["updated_at"] == session.updated_at.isoformat():
+            return list(state["history"])
+
+        messages = ChatMessage.objects.filter(session_id=session.id).order_by('created_at')
+        history = list(messages.values('role', 'content').iterator())
+        self.cache_session_state(session, history)
+        return history
+
+    def cache_session_state(self, session, history):
+        """
+        Mirror the session's history to the cache, stamped with its updated_at.
+        """
+        cache.set(
+            self.get_session_state_key(session.id),
+            {"updated_at": session.updated_at.isoformat(), "history": history},
+            SESSION_STATE_TIMEOUT
+        )
+
+    def save_message(self, session, role, content, metadata=None):
+        """
+        Save a single message to database.
+        """
+        return ChatMessage.objects.create(
+            session=session,
+            role=role,
+            content=content,
+            metadata=metadata or {}
+        )
+
+    def get_user_memories(self, user):
+        """
+        Retrieve active memories for user to include in context.
+        """
+        memories = UserMemory.objects.filter(user=user, is_active=True)
+        if not memories.exists():
+            return ""
+        
+        memory_text = "## Known Information About User:\n"
+        for mem in memories:
+            memory_text += f"- {mem.key}: {mem.value}\n"
+        return memory_text
+
+    def build_prompt(self, message, history, user_memories):
+        """
+        Assemble the full chat prompt from system prompt, memories and history.
+        """
         # Build conversation context
-        conversation_context = "\n".join([
+        conversation_context = "\n".join(
             f"{msg['role'].capitalize()}: {msg['content']}"
             for msg in history
-        ])
+        )
 
-        full_prompt = f"""{system_prompt}
+        return f"""{_SYSTEM_PROMPT}
 
 {user_memories}
 
@@ -147,17 +238,11 @@ Previous conversation:
 User: {message}
 Assistant:"""
 
-        try:
-            if image:
-                image_bytes = image.read()
-                image_part = {"mime_type": image.content_type, "data": image_bytes}
-                response = self.model.generate_content([full_prompt, image_part])
-            else:
-                response = self.model.generate_content(full_prompt)
-            ai_response = response.text
-        except Exception as e:
-            ai_response = f"I'm sorry, I'm having trouble processing your request right now. Error: {str(e)}"
-
+    def record_turn(self, session, message, ai_response, history):
+        """
+        Persist the user message and assistant reply for one chat turn, and
+        carry the extended history forward in the cache.
+        """
         # Save user message
         self.save_message(session, MessageRole.USER, message)
         
@@ -165,11 +250,48 @@ Assistant:"""
         self.save_message(session, MessageRole.ASSISTANT, ai_response)
         
         # Update session title if first message
-        if len(history) == 0:
+        if not history:
             title = message[:50] + "..." if len(message) > 50 else message
             session.title = title
             session.save()
 
+        # Stamp the session last so the cached state matches what other workers read
+        session.updated_at = timezone.now()
+        ChatSession.objects.filter(pk=session.pk).update(updated_at=session.updated_at)
+        self.cache_session_state(session, history + [
+            {"role": MessageRole.USER.value, "content": message},
+            {"role": MessageRole.ASSISTANT.value, "content": ai_response},
+        ])
+
+    def generate_response(self, message, user, session_id=None, project=None, image=None):
+        """
+        Generate AI response for user message.
+        Now uses database instead of cache.
+        """
+        # Get or create session
+        session = self.get_or_create_session(user, session_id, project)
+        
+        # Get conversation history; a session created for this message has none,
+        # so the cache and database lookups are skipped
+        history = self.get_conversation_history(session) if session_id else []
+        
+        # Get user memories for context
+        user_memories = self.get_user_memories(user)
+
+        full_prompt = self.build_prompt(message, history, user_memories)
+
+        try:
+            if image:
+                image_part = prepare_image_part(image)
+                response = hedged_call(self.model.generate_content, [full_prompt, image_part])
+            else:
+                response = hedged_call(self.model.generate_content, full_prompt)
+            ai_response = response.text
+        except Exception as e:
+            ai_response = f"I'm sorry, I'm having trouble processing your request right now. Error: {str(e)}"
+
+        self.record_turn(session, message, ai_response, history)
+
         return {
             "response": ai_response,
             "session_id": session.id
@@ -184,13 +306,14 @@ Assistant:"""
             queryset = queryset.filter(is_active=True)
         return queryset
 
-    def extract_plan_data(self, session_id, user):
+    def extract_plan_data(self, session_id, user, session=None):
         """
         Extract structured renovation plan data from conversation history.
+        Callers that already loaded the user's session can pass it in.
         """
-        try:
-            session = ChatSession.objects.get(id=session_id, user=user)
-        except ChatSession.DoesNotExist:
+        if session is None:
+            session = ChatSession.objects.filter(id=session_id, user=user).first()
+        if session is None:
             return {
                 "success": False,
                 "error": "Session not found",
@@ -206,49 +329,16 @@ Assistant:"""
                 "data": None
             }
 
-        conversation_text = "\n".join([
+        conversation_text = "\n".join(
             f"{msg['role'].capitalize()}: {msg['content']}"
             for msg in history
-        ])
-
-        extraction_prompt = f"""Analyze this conversation and extract ALL renovation-related information the user provided.
-
-Conversation:
-{conversation_text}
-
-Extract and return a JSON object with these fields (use null for missing info):
-{{
-    "building_type": "apartment/house/commercial/other",
-    "building_age": "year or decade",
-    "building_size": "square meters as number",
-    "location": "city or Bundesland",
-    "budget": "number in euros",
-    "renovation_goals": ["list", "of", "goals"],
-    "specific_materials": ["any specific materials mentioned"],
-    "rooms_involved": ["list of rooms"],
-    "current_condition": "description",
-    "timeline": "when they want to start/finish",
-    "special_requirements": ["any special needs mentioned"],
-    "heating_system": "if mentioned",
-    "energy_goals": "if mentioned"
-}}
+        )
 
-Return ONLY valid JSON, no other text."""
+        extraction_prompt = _EXTRACTION_TEMPLATE.format_map({"conversation_text": conversation_text})
 
         try:
-            response = self.model.generate_content(extraction_prompt)
-            response_text = response.text.strip()
-            
-            # Clean up response
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            import json
-            extracted_data = json.loads(response_text.strip())
+            response = self.extraction_model.generate_content(extraction_prompt)
+            extracted_data = extract_json_object(response.text)
             
             # Save extracted data to session
             session.extracted_data = extracted_data
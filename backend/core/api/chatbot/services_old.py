@@ -1,41 +1,15 @@
+import logging
 import uuid
+from functools import lru_cache
 from django.core.cache import cache
 import google.generativeai as genai
 from django.conf import settings
+from .services import extract_json_object, prepare_image_part
 
+logger = logging.getLogger(__name__)
 
-class ChatbotService:
-	def __init__(self):
-		genai.configure(api_key=settings.GEMINI_API_KEY)
-		# Using gemini-2.0-flash for compatibility
-		# self.model = genai.GenerativeModel('gemini-2.0-flash')
-		self.model = genai.GenerativeModel('gemini-2.5-pro')
-	
-	def get_session_key(self, session_id):
-		"""Generate cache key for session"""
-		return f"chatbot_session_{session_id}"
-	
-	def get_conversation_history(self, session_id):
-		"""Retrieve conversation history from cache"""
-		cache_key = self.get_session_key(session_id)
-		history = cache.get(cache_key, [])
-		return history
-	
-	def save_conversation_history(self, session_id, history):
-		"""Save conversation history to cache (expires in 1 hour)"""
-		cache_key = self.get_session_key(session_id)
-		history = history[-10:]
-		cache.set(cache_key, history, 3600)
-	
-	def generate_response(self, message, session_id=None, image=None):
-		"""Generate AI response for user message"""
-		if not session_id:
-			session_id = str(uuid.uuid4())
-		
-		history = self.get_conversation_history(session_id)
-		print('Conversation history:', history)
-		
-		system_prompt = """You are a friendly renovation planning assistant for buildings in Germany. Your goal is to have a natural conversation to understand what the user wants to renovate and gather enough details to create a useful renovation plan.
+
+_SYSTEM_PROMPT = """You are a friendly renovation planning assistant for buildings in Germany. Your goal is to have a natural conversation to understand what the user wants to renovate and gather enough details to create a useful renovation plan.
 
 ## YOUR APPROACH:
 - Be conversational and natural, not like a form or checklist
@@ -88,14 +62,88 @@ DO NOT generate the plan yourself. DO NOT offer to create it. Just confirm the d
 
 Example: "Great! I have a good understanding of your project now - you're looking to renovate the bathroom in your 1970s apartment in Bavaria, with new tiles and modern fixtures, around €8,000 budget, hoping to start in spring. 
 
-When you're ready, click the **Generate Plan** button below and I'll create a detailed renovation plan based on everything we discussed!"""		
+When you're ready, click the **Generate Plan** button below and I'll create a detailed renovation plan based on everything we discussed!"""
+
+
+_EXTRACTION_TEMPLATE = """Analyze this conversation and extract ALL renovation-related information the user provided.
+
+	CONVERSATION:
+	{conversation_text}
+
+	EXTRACT INTO THIS EXACT JSON STRUCTURE:
+	{{
+		"project_type": "string - brief description of what they want to do",
+		"building_type": "string - Single Family Home/Apartment/Multi-Family House/Commercial Building or Unknown",
+		"building_age": "string - year or decade if mentioned, otherwise Unknown",
+		"building_size": number or 0 if not mentioned,
+		"location": "string - German Bundesland if mentioned, otherwise Germany",
+		"budget": number or 0 if not mentioned,
+		"timeline": "string - when they want to start, or Flexible",
+		"current_condition": "string - Good/Moderate/Poor/Very Poor or Unknown",
+		"renovation_goals": ["array", "of", "specific", "goals"],
+		"specific_details": {{
+			"rooms_affected": ["list of rooms if mentioned"],
+			"materials_mentioned": ["any specific materials discussed"],
+			"fixtures_or_systems": ["specific items to change"],
+			"dimensions": "any size/dimension details",
+			"style_preferences": "any style or design preferences",
+			"priorities": "what matters most to them"
+		}},
+		"concerns": ["any concerns or constraints mentioned"],
+		"additional_context": "any other relevant information"
+	}}
+
+	RULES:
+	- Extract ONLY what the user explicitly stated
+	- DO NOT invent or assume values
+	- For budget and building_size, extract as numbers only (no symbols)
+	- renovation_goals should be specific to what they want to do
+	- Be thorough - capture everything useful for creating a plan
+	- Return ONLY the JSON object, no markdown, no explanation"""
+
+
+@lru_cache(maxsize=None)
+def _get_model(model_name):
+	"""Build the Gemini model once per process and reuse it across requests"""
+	genai.configure(api_key=settings.GEMINI_API_KEY)
+	return genai.GenerativeModel(model_name)
+
+
+class ChatbotService:
+	def __init__(self):
+		self.model = _get_model('gemini-2.5-pro')
+		self.extraction_model = _get_model('gemini-2.0-flash')
+	
+	def get_session_key(self, session_id):
+		"""Generate cache key for session"""
+		return f"chatbot_session_{session_id}"
+	
+	def get_conversation_history(self, session_id):
+		"""Retrieve conversation history from cache"""
+		cache_key = self.get_session_key(session_id)
+		history = cache.get(cache_key, [])
+		return history
+	
+	def save_conversation_history(self, session_id, history):
+		"""Save conversation history to cache (expires in 1 hour)"""
+		cache_key = self.get_session_key(session_id)
+		history = history[-10:]
+		cache.set(cache_key, history, 3600)
+	
+	def generate_response(self, message, session_id=None, image=None):
+		"""Generate AI response for user message"""
+		if not session_id:
+			session_id = str(uuid.uuid4())
+		
+		history = self.get_conversation_history(session_id)
+		logger.debug("Conversation history for %s: %s", session_id, history)
 		
-		conversation_context = "\n".join([
+		conversation_context = "\n".join(
 			f"User: {msg['user']}\nAssistant: {msg['assistant']}" 
 			for msg in history
-		])
+		)
 		
-		full_prompt = f"""{system_prompt}
+		full_prompt = f"""{_SYSTEM_PROMPT}
 
 Previous conversation:
 {conversation_context}
@@ -105,8 +153,7 @@ Assistant:"""
 		
 		try:
 			if image:
-				image_bytes = image.read()
-				image_part = {"mime_type": image.content_type, "data": image_bytes}
+				image_part = prepare_image_part(image)
 				response = self.model.generate_content([full_prompt, image_part])
 			else:
 				response = self.model.generate_content(full_prompt)
@@ -129,9 +176,7 @@ Assistant:"""
 		"""Extract structured renovation plan data from conversation history"""
 		
 		history = self.get_conversation_history(session_id)
-		print('===========================================')
-		print('Extracting from conversation history:', history)
-		print('===========================================')
+		logger.debug("Extracting plan data for %s from history: %s", session_id, history)
 
 		if not history:
 			return {
@@ -140,57 +185,17 @@ Assistant:"""
 				"data": None
 			}
 		
-		conversation_text = "\n".join([
+		conversation_text = "\n".join(
 			f"User: {msg['user']}\nAssistant: {msg['assistant']}" 
 			for msg in history
-		])
+		)
 		
-		extraction_prompt = f"""Analyze this conversation and extract ALL renovation-related information the user provided.
-
-	CONVERSATION:
-	{conversation_text}
-
-	EXTRACT INTO THIS EXACT JSON STRUCTURE:
-	{{
-		"project_type": "string - brief description of what they want to do",
-		"building_type": "string - Single Family Home/Apartment/Multi-Family House/Commercial Building or Unknown",
-		"building_age": "string - year or decade if mentioned, otherwise Unknown",
-		"building_size": number or 0 if not mentioned,
-		"location": "string - German Bundesland if mentioned, otherwise Germany",
-		"budget": number or 0 if not mentioned,
-		"timeline": "string - when they want to start, or Flexible",
-		"current_condition": "string - Good/Moderate/Poor/Very Poor or Unknown",
-		"renovation_goals": ["array", "of", "specific", "goals"],
-		"specific_details": {{
-			"rooms_affected": ["list of rooms if mentioned"],
-			"materials_mentioned": ["any specific materials discussed"],
-			"fixtures_or_systems": ["specific items to change"],
-			"dimensions": "any size/dimension details",
-			"style_preferences": "any style or design preferences",
-			"priorities": "what matters most to them"
-		}},
-		"concerns": ["any concerns or constraints mentioned"],
-		"additional_context": "any other relevant information"
-	}}
-
-	RULES:
-	- Extract ONLY what the user explicitly stated
-	- DO NOT invent or assume values
-	- For budget and building_size, extract as numbers only (no symbols)
-	- renovation_goals should be specific to what they want to do
-	- Be thorough - capture everything useful for creating a plan
-	- Return ONLY the JSON object, no markdown, no explanation"""
+		extraction_prompt = _EXTRACTION_TEMPLATE.format_map({"conversation_text": conversation_text})
 
 		try:
-			response = self.model.generate_content(extraction_prompt)
-			response_text = response.text.strip()
-			
-			if response_text.startswith("```"):
-				lines = response_text.split("\n")
-				response_text = "\n".join(lines[1:-1])
-			
-			import json
-			extracted_data = json.loads(response_text)
+			response = self.extraction_model.generate_content(extraction_prompt)
+			response_text = response.text
+			extracted_data = extract_json_object(response_text)
 			
 			return {
 				"success": True,
@@ -199,7 +204,7 @@ Assistant:"""
 				"session_id": session_id
 			}
 			
-		except json.JSONDecodeError as e:
+		except ValueError as e:
 			return {
 				"success": False,
 				"error": f"Failed to parse extracted data: {str(e)}",
@@ -234,4 +239,4 @@ class MockChatbotService:
 		return {
 			"response": response,
 			"session_id": session_id
-		}
\ No newline at end of file
+		}
@@ -12,6 +12,7 @@ from .views import (
     ChatSessionListView,
     ChatSessionDetailView,
     ExtractAndGeneratePlanView,
+    PlanStatusView,
     UserMemoryView,
 )
 
@@ -25,6 +26,7 @@ urlpatterns = [
     
     # Extract data and generate plan
     path('extract-and-generate/', ExtractAndGeneratePlanView.as_view(), name='extract-and-generate'),
+    path('plans/status/<str:task_id>/', PlanStatusView.as_view(), name='plan-status'),
     
     # User memory
     path('memory/', UserMemoryView.as_view(), name='user-memory'),
@@ -1,14 +1,43 @@
+import logging
+from functools import lru_cache
+
+import orjson
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.pagination import CursorPagination
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.db.models import Count, Max, OuterRef, Subquery
+from django_q.tasks import async_task, fetch
 
-from .serializers import ChatMessageSerializer, ChatResponseSerializer
 from .services import ChatbotService
-from core.models import ChatSession, ChatMessage
+from core.models import ChatSession, ChatMessage, UserMemory
+from core.tasks.queue import queued_task
+
+logger = logging.getLogger(__name__)
+
+SESSION_DETAIL_CACHE_TIMEOUT = 300
+
+
+class ChatSessionCursorPagination(CursorPagination):
+    """Most recently active sessions first, 20 per page (?limit= up to 100)."""
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = ('-updated_at', '-id')
+
+
+@lru_cache(maxsize=1)
+def _chatbot_service():
+    """Shared ChatbotService; it holds no per-request state."""
+    return ChatbotService()
 
 
 class ChatbotMessageView(APIView):
@@ -30,7 +59,7 @@ class ChatbotMessageView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        service = ChatbotService()
+        service = _chatbot_service()
 
         try:
             result = service.generate_response(
@@ -51,7 +80,7 @@ class ChatbotMessageView(APIView):
 
 class ChatSessionListView(APIView):
     """
-    GET: List all chat sessions for the authenticated user.
+    GET: List the authenticated user's chat sessions, cursor-paginated.
     POST: Create a new chat session.
     """
     permission_classes = [IsAuthenticated]
@@ -64,29 +93,31 @@ class ChatSessionListView(APIView):
         if active_only:
             sessions = sessions.filter(is_active=True)
 
-        data = []
-        for session in sessions:
-            message_count = session.messages.count()
-            last_message = session.messages.order_by('-created_at').first()
-            
-            data.append({
-                "id": session.id,
-                "title": session.title,
-                "session_type": session.session_type,
-                "is_active": session.is_active,
-                "is_plan_generated": session.is_plan_generated,
-                "message_count": message_count,
-                "last_message": last_message.content[:100] if last_message else None,
-                "last_message_at": last_message.created_at if last_message else None,
-                "created_at": session.created_at,
-                "updated_at": session.updated_at,
-            })
+        # Count and latest-message preview come back in the same query
+        latest_message = ChatMessage.objects.filter(session=OuterRef('pk')).order_by('-created_at')
+        sessions = sessions.annotate(
+            message_count=Count('messages'),
+            last_message_at=Max('messages__created_at'),
+            last_message_content=Subquery(latest_message.values('content')[:1]),
+        ).values(
+            'id', 'title', 'session_type', 'is_active', 'is_plan_generated',
+            'message_count', 'last_message_content', 'last_message_at',
+            'created_at', 'updated_at',
+        )
 
-        return Response(data, status=status.HTTP_200_OK)
+        paginator = ChatSessionCursorPagination()
+        data = paginator.paginate_queryset(sessions, request, view=self)
+
+        # Rows are plain dicts; only the preview needs reshaping
+        for row in data:
+            last_content = row.pop('last_message_content')
+            row['last_message'] = last_content[:100] if last_content is not None else None
+
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         """Create a new chat session."""
-        service = ChatbotService()
+        service = _chatbot_service()
         session = service.get_or_create_session(
             user=request.user,
             session_id=None,
@@ -110,28 +141,32 @@ class ChatSessionDetailView(APIView):
 
     def get(self, request, session_id):
         """Get session details with all messages."""
-        try:
-            session = ChatSession.objects.get(id=session_id, user=request.user)
-        except ChatSession.DoesNotExist:
+        session = ChatSession.objects.filter(id=session_id, user=request.user).first()
+        if session is None:
             return Response(
                 {"error": "Session not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        messages = ChatMessage.objects.filter(session=session).order_by('created_at')
-        
-        messages_data = [
-            {
-                "id": msg.id,
-                "role": msg.role,
-                "content": msg.content,
-                "metadata": msg.metadata,
-                "created_at": msg.created_at,
-            }
-            for msg in messages
-        ]
+        # Any change to the session or its messages bumps updated_at, so stale
+        # payloads are never served and simply age out of the cache.
+        cache_key = f"chatsess:{session.id}:{session.updated_at.timestamp()}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return HttpResponse(cached, content_type="application/json")
 
-        return Response({
+        return StreamingHttpResponse(
+            self.stream_payload(session, cache_key),
+            content_type="application/json"
+        )
+
+    @staticmethod
+    def stream_payload(session, cache_key):
+        """
+        Yield the session JSON message by message, caching the full body once
+        the last chunk has been produced.
+        """
+        header = orjson.dumps({
             "id": session.id,
             "title": session.title,
             "session_type": session.session_type,
@@ -140,130 +175,144 @@ class ChatSessionDetailView(APIView):
             "extracted_data": session.extracted_data,
             "created_at": session.created_at,
             "updated_at": session.updated_at,
-            "messages": messages_data,
-        }, status=status.HTTP_200_OK)
+        }, option=orjson.OPT_UTC_Z)
+        chunks = [header[:-1] + b',"messages":[']
+        yield chunks[0]
+
+        messages = ChatMessage.objects.filter(session_id=session.id).order_by('created_at').values(
+            'id', 'role', 'content', 'metadata', 'created_at'
+        )
+        for index, msg in enumerate(messages.iterator(chunk_size=200)):
+            chunk = orjson.dumps(msg, option=orjson.OPT_UTC_Z)
+            if index:
+                chunk = b"," + chunk
+            chunks.append(chunk)
+            yield chunk
+
+        chunks.append(b"]}")
+        yield chunks[-1]
+
+        cache.set(cache_key, b"".join(chunks), SESSION_DETAIL_CACHE_TIMEOUT)
 
     def delete(self, request, session_id):
         """Deactivate a session (soft delete)."""
-        try:
-            session = ChatSession.objects.get(id=session_id, user=request.user)
-        except ChatSession.DoesNotExist:
+        # updated_at is set explicitly because update() skips auto_now
+        updated = ChatSession.objects.filter(id=session_id, user=request.user).update(
+            is_active=False,
+            updated_at=timezone.now()
+        )
+        if not updated:
             return Response(
                 {"error": "Session not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        session.is_active = False
-        session.save()
-
         return Response(
             {"message": "Session deactivated"},
             status=status.HTTP_200_OK
         )
 
 
+def _validate_extract_request(request):
+    """
+    Check the extract-and-generate body before any DB or service work.
+    Returns (session_id, None) or (None, error Response).
+    """
+    session_id = request.data.get("session_id")
+
+    if not session_id:
+        return None, Response(
+            {"success": False, "error": "session_id is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        return int(session_id), None
+    except (TypeError, ValueError):
+        return None, Response(
+            {"success": False, "error": "session_id must be an integer"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
 class ExtractAndGeneratePlanView(APIView):
     """
     POST endpoint to extract data from chat and generate renovation plan.
+    The work runs as a Django-Q task; poll PlanStatusView with the task id.
     Requires authentication.
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        session_id = request.data.get("session_id")
+        session_id, error_response = _validate_extract_request(request)
+        if error_response is not None:
+            return error_response
 
-        if not session_id:
+        if not ChatSession.objects.filter(id=session_id, user=request.user).exists():
             return Response(
-                {"success": False, "error": "session_id is required"},
+                {"success": False, "error": "Session not found", "step": "extraction"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        chatbot_service = ChatbotService()
-        extraction_result = chatbot_service.extract_plan_data(
-            session_id=session_id,
-            user=request.user
+        task_id = async_task(
+            'core.tasks.plan_generation.generate_plan_from_chat',
+            session_id,
+            request.user.id,
         )
 
-        if not extraction_result["success"]:
-            return Response(
-                {
-                    "success": False,
-                    "error": extraction_result["error"],
-                    "step": "extraction"
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response({
+            "task_id": task_id,
+            "session_id": session_id,
+        }, status=status.HTTP_202_ACCEPTED)
 
-        extracted_data = extraction_result["data"]
-
-        # Import here to avoid circular imports
-        from core.api.planning_work.services import GeminiService
-
-        plan_input = {
-            "building_type": extracted_data.get("building_type") or "Unknown",
-            "budget": float(extracted_data.get("budget") or 0),
-            "location": extracted_data.get("location") or "Germany",
-            "building_size": int(extracted_data.get("building_size") or 0),
-            "goals": extracted_data.get("renovation_goals") or [],
-            "building_age": extracted_data.get("building_age") or "Unknown",
-            "current_condition": extracted_data.get("current_condition") or "",
-            "specific_materials": extracted_data.get("specific_materials") or [],
-            "rooms_involved": extracted_data.get("rooms_involved") or [],
-            "timeline": extracted_data.get("timeline") or "",
-            "special_requirements": extracted_data.get("special_requirements") or [],
-        }
 
-        try:
-            gemini_service = GeminiService()
-            plan_result = gemini_service.generate_renovation_plan(
-                building_type=plan_input["building_type"],
-                budget=plan_input["budget"],
-                location=plan_input["location"],
-                building_size=plan_input["building_size"],
-                renovation_goals=plan_input["goals"],
-                dynamic_context=plan_input
+class PlanStatusView(APIView):
+    """
+    GET: Status of a plan generation task started by ExtractAndGeneratePlanView.
+    Returns 202 while the task is running and the plan payload once it finishes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id):
+        task = fetch(task_id)
+        # Still queued or running; unknown and pruned ids are not found
+        args = task.args if task is not None else (queued_task(task_id) or {}).get("args", ())
+
+        if len(args) < 2 or args[1] != request.user.id:
+            return Response(
+                {"error": "Task not found"},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-            # Mark session as plan generated
-            try:
-                session = ChatSession.objects.get(id=session_id, user=request.user)
-                session.is_plan_generated = True
-                session.save()
-            except ChatSession.DoesNotExist:
-                pass
-
-            # Save the plan to database
-            from core.models import RenovationPlan
-            
-            if plan_result.get('success') and plan_result.get('plan'):
-                renovation_plan = RenovationPlan.objects.create(
-                    user=request.user,
-                    plan_name=f"Plan from Chat - {session.title}" if session else "Chat Generated Plan",
-                    plan_data=plan_result.get('plan', {}),
-                    input_data=plan_input,
-                    status='generated'
-                )
-                plan_result['plan_id'] = renovation_plan.id
-
-            return Response({
-                "success": True,
-                "extracted_data": extracted_data,
-                "plan": plan_result,
-                "session_id": session_id
-            }, status=status.HTTP_200_OK)
+        if task is None:
+            return Response(
+                {"task_id": task_id, "state": "pending"},
+                status=status.HTTP_202_ACCEPTED
+            )
 
-        except Exception as e:
-            print(f"Error during plan generation: {str(e)}")
+        if not task.success:
+            logger.error("Plan generation task %s failed: %s", task_id, task.result)
             return Response(
                 {
                     "success": False,
-                    "error": f"Plan generation failed: {str(e)}",
+                    "state": "failed",
+                    "error": "Plan generation failed",
                     "step": "generation",
-                    "extracted_data": extracted_data
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+        result = task.result
+        if not result.get("success"):
+            error_status = (
+                status.HTTP_400_BAD_REQUEST
+                if result.get("step") == "extraction"
+                else status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            return Response({**result, "state": "failed"}, status=error_status)
+
+        return Response({**result, "state": "complete"}, status=status.HTTP_200_OK)
+
 
 class UserMemoryView(APIView):
     """
@@ -274,8 +323,6 @@ class UserMemoryView(APIView):
 
     def get(self, request):
         """Get all active memories for current user."""
-        from core.models import UserMemory
-        
         memories = UserMemory.objects.filter(user=request.user, is_active=True)
         
         data = [
@@ -295,8 +342,6 @@ class UserMemoryView(APIView):
 
     def delete(self, request):
         """Deactivate all memories for user."""
-        from core.models import UserMemory
-        
         UserMemory.objects.filter(user=request.user).update(is_active=False)
         
         return Response(
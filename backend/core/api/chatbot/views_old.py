@@ -1,14 +1,16 @@
+import logging
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .serializers import ChatMessageSerializer, ChatResponseSerializer
 from .services import ChatbotService, MockChatbotService
 from rest_framework.parsers import MultiPartParser, FormParser
 from core.api.planning_work.services import GeminiService
 
+logger = logging.getLogger(__name__)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ChatbotMessageView(APIView):
 	"""
@@ -17,29 +19,23 @@ class ChatbotMessageView(APIView):
 	permission_classes = [AllowAny]
 	parser_classes = [MultiPartParser, FormParser]
 	def post(self, request):
-		print('Request data:', request.data)
-		serializer = ChatMessageSerializer(data=request.data)
-		print('data', serializer)
-		if not serializer.is_valid():
+		logger.debug("Chatbot request data: %s", request.data)
+		message = request.data.get("message")
+		session_id = request.data.get("session_id") or None
+		image = request.FILES.get("image")
+		
+		if not message:
 			return Response(
-				serializer.errors,
+				{"message": ["This field is required."]},
 				status=status.HTTP_400_BAD_REQUEST
 			)
 		
-		message = serializer.validated_data.get("message")
-		session_id = serializer.validated_data.get("session_id", None)
-		image = serializer.validated_data.get("image", None)
 		service = ChatbotService()
 		
 		try:
 			result = service.generate_response(message, session_id, image) 
 			
-			response_serializer = ChatResponseSerializer(result)
-			
-			return Response(
-				response_serializer.data,
-				status=status.HTTP_200_OK
-			)
+			return Response(result, status=status.HTTP_200_OK)
 		
 		except Exception as e:
 			return Response(
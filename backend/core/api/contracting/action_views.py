@@ -2,6 +2,8 @@
 Action Views - Handle approval, rejection, and modification of AI-proposed actions
 """
 import logging
+from functools import lru_cache
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,11 +11,17 @@ from rest_framework.permissions import IsAuthenticated
 
 from core.models import ContractingPlanning, MessageAction
 from core.services.contracting_service.conversation_agent import ConversationAgent
-from .conversation_serializer import MessageSerializer, MessageActionSerializer
+from .conversation_serializer import MessageSerializer, MessageActionSerializer, ModifyActionInputSerializer
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _conversation_agent():
+    """Shared ConversationAgent; it holds no per-request state."""
+    return ConversationAgent()
+
+
 class ApproveActionView(APIView):
     """
     POST /contracting/planning/<project_id>/conversations/<contractor_id>/actions/<action_id>/approve/
@@ -28,7 +36,7 @@ class ApproveActionView(APIView):
             planning = ContractingPlanning.objects.filter(
                 project_id=project_id,
                 project__user=request.user
-            ).first()
+            ).only('id', 'project_id').first()
             
             if not planning:
                 return Response(
@@ -37,9 +45,10 @@ class ApproveActionView(APIView):
                 )
             
             # Get the action
-            try:
-                action = MessageAction.objects.select_related('message').get(id=action_id)
-            except MessageAction.DoesNotExist:
+            action = MessageAction.objects.select_related(
+                'message__contracting_planning'
+            ).filter(id=action_id).first()
+            if action is None:
                 return Response(
                     {'detail': 'Action not found'},
                     status=status.HTTP_404_NOT_FOUND
@@ -54,7 +63,7 @@ class ApproveActionView(APIView):
                 )
             
             # Execute the action
-            agent = ConversationAgent()
+            agent = _conversation_agent()
             result = agent.execute_action(action_id, request.user)
             
             if not result.get('success'):
@@ -75,7 +84,7 @@ class ApproveActionView(APIView):
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error approving action: {str(e)}", exc_info=True)
+            logger.error("Error approving action: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error approving action: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -96,7 +105,7 @@ class RejectActionView(APIView):
             planning = ContractingPlanning.objects.filter(
                 project_id=project_id,
                 project__user=request.user
-            ).first()
+            ).only('id', 'project_id').first()
             
             if not planning:
                 return Response(
@@ -105,9 +114,10 @@ class RejectActionView(APIView):
                 )
             
             # Get the action
-            try:
-                action = MessageAction.objects.select_related('message').get(id=action_id)
-            except MessageAction.DoesNotExist:
+            action = MessageAction.objects.select_related(
+                'message__contracting_planning'
+            ).filter(id=action_id).first()
+            if action is None:
                 return Response(
                     {'detail': 'Action not found'},
                     status=status.HTTP_404_NOT_FOUND
@@ -122,7 +132,7 @@ class RejectActionView(APIView):
                 )
             
             # Reject the action
-            agent = ConversationAgent()
+            agent = _conversation_agent()
             result = agent.reject_action(action_id, request.user)
             
             if not result.get('success'):
@@ -140,7 +150,7 @@ class RejectActionView(APIView):
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error rejecting action: {str(e)}", exc_info=True)
+            logger.error("Error rejecting action: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error rejecting action: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -156,12 +166,30 @@ class ModifyActionView(APIView):
     
     def post(self, request, project_id, contractor_id, action_id):
         """Modify a pending action"""
+        # Validate and coerce the body before any DB or agent work
+        input_serializer = ModifyActionInputSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {'detail': 'Invalid modification request', 'errors': input_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        modifications = input_serializer.validated_data.get('modifications')
+        modified_email_html = input_serializer.validated_data.get('email_html')
+        execute_after_modify = input_serializer.validated_data['execute']
+        
+        if not modifications and not modified_email_html:
+            return Response(
+                {'detail': 'Either modifications or email_html is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         try:
             # Verify the planning belongs to the user
             planning = ContractingPlanning.objects.filter(
                 project_id=project_id,
                 project__user=request.user
-            ).first()
+            ).only('id', 'project_id').first()
             
             if not planning:
                 return Response(
@@ -170,9 +198,10 @@ class ModifyActionView(APIView):
                 )
             
             # Get the action
-            try:
-                action = MessageAction.objects.select_related('message').get(id=action_id)
-            except MessageAction.DoesNotExist:
+            action = MessageAction.objects.select_related(
+                'message__contracting_planning'
+            ).filter(id=action_id).first()
+            if action is None:
                 return Response(
                     {'detail': 'Action not found'},
                     status=status.HTTP_404_NOT_FOUND
@@ -186,19 +215,8 @@ class ModifyActionView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Get modification data
-            modifications = request.data.get('modifications')
-            modified_email_html = request.data.get('email_html')
-            execute_after_modify = request.data.get('execute', False)
-            
-            if not modifications and not modified_email_html:
-                return Response(
-                    {'detail': 'Either modifications or email_html is required'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
             # Execute with modifications
-            agent = ConversationAgent()
+            agent = _conversation_agent()
             
             if execute_after_modify:
                 # Modify and execute
@@ -228,8 +246,6 @@ class ModifyActionView(APIView):
                 }, status=status.HTTP_200_OK)
             else:
                 # Just apply modifications without executing
-                from core.services.contracting_service.conversation_agent import ConversationAgent
-                agent = ConversationAgent()
                 updated_action = agent._apply_modifications(
                     action,
                     modifications,
@@ -247,8 +263,151 @@ class ModifyActionView(APIView):
                 }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error modifying action: {str(e)}", exc_info=True)
+            logger.error("Error modifying action: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error modifying action: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class BulkActionView(APIView):
+    """
+    POST /contracting/planning/<project_id>/conversations/<contractor_id>/actions/bulk/
+    Approve, reject or modify several pending actions in one request.
+
+    Body: {"actions": [{"id": 1, "decision": "approve"|"reject"|"modify",
+                        "modifications": "...", "email_html": "...", "execute": false}]}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    DECISIONS = ('approve', 'reject', 'modify')
+    
+    def post(self, request, project_id, contractor_id):
+        """Apply a decision to each listed action and return per-action results"""
+        items = request.data.get('actions')
+        
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'actions must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        action_ids = []
+        for item in items:
+            try:
+                action_ids.append(int(item['id']))
+            except (TypeError, KeyError, ValueError):
+                action_ids = None
+            if action_ids is None or item.get('decision') not in self.DECISIONS:
+                return Response(
+                    {'detail': f'Each action needs an id and a decision ({", ".join(self.DECISIONS)})'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        try:
+            # Verify the planning belongs to the user
+            planning = ContractingPlanning.objects.filter(
+                project_id=project_id,
+                project__user=request.user
+            ).only('id', 'project_id').first()
+            
+            if not planning:
+                return Response(
+                    {'detail': 'Contracting planning not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            # Load every action in one query, scoped to this conversation
+            actions = MessageAction.objects.select_related(
+                'message__contracting_planning'
+            ).filter(
+                id__in=action_ids,
+                message__contracting_planning_id=planning.id,
+                message__contractor_id=contractor_id
+            ).in_bulk()
+            
+            missing = [action_id for action_id in action_ids if action_id not in actions]
+            if missing:
+                return Response(
+                    {'detail': 'Actions not found in this conversation', 'missing_ids': missing},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            agent = _conversation_agent()
+            results = [
+                self._apply_decision(agent, actions[action_id], item, request.user)
+                for action_id, item in zip(action_ids, items)
+            ]
+            
+            return Response({
+                'success': all(result['success'] for result in results),
+                'results': results
+            }, status=status.HTTP_200_OK)
+        
+        except Exception as e:
+            logger.error("Error processing bulk actions: %s", e, exc_info=True)
+            return Response(
+                {'detail': f'Error processing bulk actions: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    def _apply_decision(self, agent, action, item, user):
+        """Run a single decision and shape its result like the single-action views"""
+        decision = item['decision']
+        input_serializer = ModifyActionInputSerializer(data=item)
+        if not input_serializer.is_valid():
+            return {
+                'id': action.id,
+                'success': False,
+                'error': input_serializer.errors
+            }
+        modifications = input_serializer.validated_data.get('modifications')
+        modified_email_html = input_serializer.validated_data.get('email_html')
+        
+        if decision == 'modify' and not modifications and not modified_email_html:
+            return {
+                'id': action.id,
+                'success': False,
+                'error': 'Either modifications or email_html is required'
+            }
+        
+        if decision == 'reject':
+            result = agent.reject_action(action.id, user)
+        elif decision == 'approve' or input_serializer.validated_data['execute']:
+            result = agent.execute_action(
+                action.id,
+                user,
+                modifications=modifications,
+                modified_email_html=modified_email_html
+            )
+        else:
+            updated_action = agent._apply_modifications(
+                action,
+                modifications,
+                modified_email_html,
+                user
+            )
+            return {
+                'id': action.id,
+                'success': True,
+                'executed': False,
+                'action': MessageActionSerializer(updated_action).data
+            }
+        
+        if not result.get('success'):
+            return {
+                'id': action.id,
+                'success': False,
+                'error': result.get('error', f'Failed to {decision} action')
+            }
+        
+        response = {
+            'id': action.id,
+            'success': True,
+            'action': MessageActionSerializer(result['action']).data
+        }
+        if 'confirmation_message' in result:
+            response['executed'] = True
+            response['confirmation_message'] = MessageSerializer(result['confirmation_message']).data
+            response['result'] = result.get('result', {})
+        return response
@@ -1,7 +1,7 @@
 import logging
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from core.models import ContractingPlanning, Project
+from core.models import ContractingPlanning
 from .contracting_planning_serializer import ContractingPlanningSerializer
 
 logger = logging.getLogger(__name__)
@@ -18,17 +18,11 @@ class ContractingPlanningAnswerView(generics.UpdateAPIView):
     def get_object(self):
         project_id = self.kwargs.get('project_id')
         
-        # Verify the project belongs to the user
-        try:
-            project = Project.objects.get(id=project_id, user=self.request.user)
-        except Project.DoesNotExist:
-            return None
-        
-        # Get planning for this project
-        try:
-            return ContractingPlanning.objects.get(project=project)
-        except ContractingPlanning.DoesNotExist:
-            return None
+        # Planning for this project, only if the project belongs to the user
+        return ContractingPlanning.objects.select_related('project').prefetch_related('files').filter(
+            project_id=project_id,
+            project__user=self.request.user
+        ).first()
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -52,7 +46,7 @@ class ContractingPlanningAnswerView(generics.UpdateAPIView):
         instance.user_answers = user_answers
         instance.save(update_fields=['user_answers'])
         
-        logger.info(f"User answers saved for planning {instance.id}")
+        logger.info("User answers saved for planning %s", instance.id)
         
         # Return updated planning
         serializer = self.get_serializer(instance)
@@ -3,7 +3,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from core.models import ContractingPlanning, Project
-from core.services.contracting_service.contracting_service import get_contracting_service
+from django_q.tasks import async_task
 from .contracting_planning_serializer import ContractingPlanningSerializer
 
 logger = logging.getLogger(__name__)
@@ -39,71 +39,26 @@ class ContractingPlanningCreateView(generics.CreateAPIView):
         # Check if planning already exists for this project
         existing_planning = ContractingPlanning.objects.filter(project=project).first()
 
-        if existing_planning:
-            # Update existing planning
-            serializer = self.get_serializer(
-                existing_planning,
-                data=request.data,
-                partial=True
-            )
-        else:
-            # Create new planning
-            data = request.data.copy()
-            data['project'] = project.id
-            serializer = self.get_serializer(data=data)
-
+        # Update the existing planning or create a new one; the project is
+        # passed to save() rather than copied into the request data
+        serializer = self.get_serializer(
+            existing_planning,
+            data=request.data,
+            partial=existing_planning is not None
+        )
         serializer.is_valid(raise_exception=True)
 
-        # Handle file uploads
-        files = request.FILES.getlist('files')
-        if files:
-            serializer.validated_data['uploaded_files'] = files
-
-        # Save the planning
-        planning = serializer.save()
-        is_update = existing_planning is not None
-
-        # Process with Gemini AI
-        contracting_service = get_contracting_service()
-        ai_results = None
-        
-        try:
-            logger.info(f"Processing planning {planning.id} with Gemini AI")
-            
-            # Process user input and files with Gemini
-            ai_results = contracting_service.process_planning_with_ai(planning=planning)
-            
-            # Save AI insights to database
-            if ai_results.get('success'):
-                planning.ai_summary = ai_results.get('summary', '')
-                planning.ai_questions = ai_results.get('questions', [])
-                planning.save(update_fields=['ai_summary', 'ai_questions'])
-                logger.info(f"AI insights saved to database for planning {planning.id}")
-            
-            logger.info(f"AI processing completed for planning {planning.id}")
-            
-        except Exception as e:
-            # Log error but don't fail the request
-            logger.error(f"AI processing failed for planning {planning.id}: {str(e)}", exc_info=True)
-            ai_results = {
-                'success': False,
-                'error': 'AI processing temporarily unavailable',
-                'summary': '',
-                'questions': []
-            }
-
-        # Refresh from database to get latest data
-        planning.refresh_from_db()
-        
-        # Build response with AI insights
-        response_data = {
-            **serializer.data,
-            'ai_summary': planning.ai_summary,
-            'ai_questions': planning.ai_questions,
-            'user_answers': planning.user_answers,
-        }
+        # Save the planning together with any uploaded files
+        planning = serializer.save(
+            project=project,
+            uploaded_files=request.FILES.getlist('files')
+        )
 
-        # Return appropriate status code
-        response_status = status.HTTP_200_OK if is_update else status.HTTP_201_CREATED
-        return Response(response_data, status=response_status)
+        # Gemini file upload and question generation run in a Django-Q task;
+        # clients poll the detail view until ai_status leaves 'processing'
+        planning.ai_status = 'processing'
+        planning.save(update_fields=['ai_status', 'updated_at'])
+        async_task('core.tasks.planning_ai.process_planning_with_ai_task', planning.id)
+        logger.info("Queued AI processing for planning %s", planning.id)
 
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
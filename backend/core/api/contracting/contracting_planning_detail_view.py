@@ -1,9 +1,12 @@
 import logging
-from rest_framework import generics, permissions, status
+from django.utils import timezone
+from django_q.tasks import async_task
+from rest_framework import generics, permissions
 from rest_framework.response import Response
-from core.models import ContractingPlanning, Project
-from core.services.contracting_service.contracting_service import get_contracting_service
+from core.models import ContractingPlanning
+from core.models.contracting_planning import AI_PROCESSING_TIMEOUT
 from .contracting_planning_serializer import ContractingPlanningSerializer
+from .planning_lookup import get_planning_for_user
 
 logger = logging.getLogger(__name__)
 
@@ -13,34 +16,22 @@ class ContractingPlanningDetailView(generics.RetrieveAPIView):
 	Retrieve contracting planning for a specific project
 	
 	Query Parameters:
-		- regenerate_ai: If 'true', regenerates AI insights
+		- regenerate_ai: If 'true', queues regeneration of AI insights; poll ai_status for the result
 	"""
 	serializer_class = ContractingPlanningSerializer
 	permission_classes = [permissions.IsAuthenticated]
 	lookup_field = 'project_id'
 
 	def get_object(self):
-		project_id = self.kwargs.get('project_id')
-		
-		# Verify the project belongs to the user
-		try:
-			project = Project.objects.get(id=project_id, user=self.request.user)
-		except Project.DoesNotExist:
-			return None
-		
-		# Get planning for this project
-		try:
-			return ContractingPlanning.objects.get(project=project)
-		except ContractingPlanning.DoesNotExist:
-			return None
+		# Planning for this project, only if the project belongs to the user
+		return get_planning_for_user(
+			self.kwargs.get('project_id'),
+			self.request.user,
+			prefetch_related=('files',)
+		)
 	
 	def retrieve(self, request, *args, **kwargs):
 		instance = self.get_object()
-		if instance is None:
-			return Response(
-				{'detail': 'Planning not found'},
-				status=status.HTTP_404_NOT_FOUND
-			)
 		
 		serializer = self.get_serializer(instance)
 		response_data = serializer.data
@@ -49,28 +40,24 @@ class ContractingPlanningDetailView(generics.RetrieveAPIView):
 		regenerate_ai = request.query_params.get('regenerate_ai', '').lower() == 'true'
 		
 		if regenerate_ai:
-			try:
-				logger.info(f"Regenerating AI insights for planning {instance.id}")
-				contracting_service = get_contracting_service()
-				
-				ai_results = contracting_service.process_planning_with_ai(
-					planning=instance,
-					generate_questions=True,
-					analyze_files=instance.files.exists()
-				)
-				
-				response_data['ai_insights'] = {
-					'generated_questions': ai_results.get('questions', []),
-					'file_analysis': ai_results.get('file_analysis'),
-					'recommendations': ai_results.get('recommendations'),
-					'ai_available': ai_results.get('success', False)
-				}
-				
-			except Exception as e:
-				logger.error(f"Failed to regenerate AI insights: {str(e)}", exc_info=True)
-				response_data['ai_insights'] = {
-					'error': 'AI processing temporarily unavailable'
-				}
+			# Gemini runs in a Django-Q task that stores the new summary and questions;
+			# the conditional update keeps concurrent requests from enqueuing twice,
+			# while a 'processing' status older than the task timeout can be retried
+			started_at = timezone.now()
+			enqueued = ContractingPlanning.objects.filter(id=instance.id).exclude(
+				ai_status='processing',
+				updated_at__gt=started_at - AI_PROCESSING_TIMEOUT
+			).update(ai_status='processing', updated_at=started_at)
+			
+			if enqueued:
+				logger.info("Regenerating AI insights for planning %s", instance.id)
+				async_task('core.tasks.planning_ai.process_planning_with_ai_task', instance.id)
+			
+			response_data['ai_status'] = 'processing'
+			response_data['ai_insights'] = {
+				'status': 'regenerating',
+				'started_at': started_at if enqueued else instance.updated_at
+			}
 		
 		return Response(response_data)
 
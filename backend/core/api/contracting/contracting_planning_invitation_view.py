@@ -1,10 +1,12 @@
 import logging
+from django.db import transaction
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
-from core.models import ContractingPlanning, Contractor, Project
+from core.models import Contractor
 from core.services.contracting_service.contracting_service import get_contracting_service
 from .contracting_planning_serializer import ContractingPlanningSerializer
+from .planning_lookup import get_planning_for_user
 
 logger = logging.getLogger(__name__)
 
@@ -36,23 +38,17 @@ class ContractingPlanningInvitationView(generics.GenericAPIView):
             ]
         }
         """
-        # Verify the project exists and belongs to the user
-        try:
-            project = Project.objects.get(id=project_id, user=request.user)
-        except Project.DoesNotExist:
-            return Response(
-                {'detail': 'Project not found or you do not have permission to access it'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Get or create contracting planning for this project
-        try:
-            planning = ContractingPlanning.objects.get(project=project)
-        except ContractingPlanning.DoesNotExist:
-            return Response(
-                {'detail': 'Contracting planning not found. Please complete the planning step first.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # Load the planning with its project and files in one go; the project
+        # must belong to the user
+        planning = get_planning_for_user(
+            project_id,
+            request.user,
+            select_related=('project__user',),
+            prefetch_related=('files',),
+            # The invitation prompt reads description, questions and answers,
+            # but never the AI summary
+            defer=('ai_summary',)
+        )
         
         # Get contractor IDs from request
         contractor_ids = request.data.get('contractor_ids', [])
@@ -63,35 +59,42 @@ class ContractingPlanningInvitationView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate that contractor IDs are valid
+        # Validate that contractor IDs are valid; the rows fetched here are the
+        # ones handed to the invitation generator, so this is the only query.
+        # Duplicate or unknown ids leave the map shorter than the request.
         try:
-            contractors = Contractor.objects.filter(id__in=contractor_ids)
-            if contractors.count() != len(contractor_ids):
+            contractor_map = Contractor.objects.in_bulk(contractor_ids)
+            contractors = list(contractor_map.values())
+            if len(contractor_map) != len(contractor_ids):
                 return Response(
                     {'detail': 'Some contractor IDs are invalid'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         except Exception as e:
-            logger.error(f"Error fetching contractors: {str(e)}")
+            logger.error("Error fetching contractors: %s", e)
             return Response(
                 {'detail': 'Error validating contractor IDs'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Save selected contractors to planning
-        planning.selected_contractors = list(contractor_ids)
-        planning.save(update_fields=['selected_contractors'])
+        # Save selected contractors to planning; the JSON list is kept in sync
+        # for readers that have not moved to the relation yet. The AI call below
+        # runs after the commit so no transaction is held across network I/O.
+        with transaction.atomic():
+            planning.selected_contractors = list(contractor_ids)
+            planning.save(update_fields=['selected_contractors'])
+            planning.selected_contractors_m2m.set(contractors)
         
         # Generate invitation content with AI
         contracting_service = get_contracting_service()
         
         try:
-            logger.info(f"Generating invitation content for planning {planning.id} with {len(contractors)} contractors")
+            logger.info("Generating invitation content for planning %s with %s contractors", planning.id, len(contractors))
             
             # Generate email and renovation plan
             result = contracting_service.generate_invitation_content(
                 planning=planning,
-                contractors=list(contractors)
+                contractors=contractors
             )
             
             if not result.get('success'):
@@ -100,18 +103,21 @@ class ContractingPlanningInvitationView(generics.GenericAPIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             
-            # Build relevant files list with URLs
-            relevant_files = []
-            for file_id in result.get('relevant_file_ids', []):
-                try:
-                    file_obj = planning.files.get(id=file_id)
-                    relevant_files.append({
-                        'id': file_obj.id,
-                        'filename': file_obj.filename,
-                        'url': request.build_absolute_uri(file_obj.file.url) if file_obj.file else ''
-                    })
-                except Exception as e:
-                    logger.warning(f"Could not find file with ID {file_id}: {str(e)}")
+            # Build relevant files list with URLs from the prefetched files; no
+            # query per id, and unknown ids are logged together
+            relevant_file_ids = result.get('relevant_file_ids', [])
+            files_by_id = {file_obj.id: file_obj for file_obj in planning.files.all()}
+            missing_ids = set(relevant_file_ids) - files_by_id.keys()
+            if missing_ids:
+                logger.warning("Could not find files with IDs %s", sorted(missing_ids))
+            relevant_files = [
+                {
+                    'id': file_obj.id,
+                    'filename': file_obj.filename,
+                    'url': request.build_absolute_uri(file_obj.file.url) if file_obj.file else ''
+                }
+                for file_obj in (files_by_id[file_id] for file_id in relevant_file_ids if file_id in files_by_id)
+            ]
             
             response_data = {
                 'email_html': result.get('email_html', ''),
@@ -119,11 +125,11 @@ class ContractingPlanningInvitationView(generics.GenericAPIView):
                 'relevant_files': relevant_files
             }
             
-            logger.info(f"Successfully generated invitation content for planning {planning.id}")
+            logger.info("Successfully generated invitation content for planning %s", planning.id)
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error generating invitation content: {str(e)}", exc_info=True)
+            logger.error("Error generating invitation content: %s", e, exc_info=True)
             return Response(
                 {'detail': 'AI processing temporarily unavailable', 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -2,9 +2,9 @@ import logging
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
-from core.models import ContractingPlanning, Project
 from core.services.contracting_service.contracting_service import get_contracting_service
 from .contracting_planning_serializer import ContractingPlanningSerializer
+from .planning_lookup import get_planning_for_user
 
 logger = logging.getLogger(__name__)
 
@@ -32,23 +32,9 @@ class ContractingPlanningModifyEmailView(generics.GenericAPIView):
             "email_html": "<html>modified email...</html>"
         }
         """
-        # Verify the project exists and belongs to the user
-        try:
-            project = Project.objects.get(id=project_id, user=request.user)
-        except Project.DoesNotExist:
-            return Response(
-                {'detail': 'Project not found or you do not have permission to access it'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Get contracting planning for this project
-        try:
-            planning = ContractingPlanning.objects.get(project=project)
-        except ContractingPlanning.DoesNotExist:
-            return Response(
-                {'detail': 'Contracting planning not found. Please complete the planning step first.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # Load the planning with its project in one query; the project must
+        # belong to the user
+        planning = get_planning_for_user(project_id, request.user, select_related=('project__user',))
         
         # Get request data
         current_email_html = request.data.get('current_email_html', '')
@@ -70,7 +56,7 @@ class ContractingPlanningModifyEmailView(generics.GenericAPIView):
         contracting_service = get_contracting_service()
         
         try:
-            logger.info(f"Modifying email for planning {planning.id} with user prompt")
+            logger.info("Modifying email for planning %s with user prompt", planning.id)
             
             # Modify email
             result = contracting_service.modify_email_with_ai(
@@ -89,11 +75,11 @@ class ContractingPlanningModifyEmailView(generics.GenericAPIView):
                 'email_html': result.get('email_html', current_email_html)
             }
             
-            logger.info(f"Successfully modified email for planning {planning.id}")
+            logger.info("Successfully modified email for planning %s", planning.id)
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error modifying email: {str(e)}", exc_info=True)
+            logger.error("Error modifying email: %s", e, exc_info=True)
             return Response(
                 {'detail': 'AI processing temporarily unavailable', 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1,10 +1,13 @@
 import logging
-import io
-from django.http import HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from django.urls import reverse
+from django_q.tasks import async_task, fetch
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
 from core.models import Project
+from core.tasks.queue import queued_task
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +32,7 @@ class ContractingPlanningPDFView(generics.GenericAPIView):
         Returns: PDF file as downloadable response
         """
         # Verify the project exists and belongs to the user
-        try:
-            project = Project.objects.get(id=project_id, user=request.user)
-        except Project.DoesNotExist:
+        if not Project.objects.filter(id=project_id, user=request.user).exists():
             return Response(
                 {'detail': 'Project not found or you do not have permission to access it'},
                 status=status.HTTP_404_NOT_FOUND
@@ -51,78 +52,70 @@ class ContractingPlanningPDFView(generics.GenericAPIView):
         if not filename.endswith('.pdf'):
             filename += '.pdf'
         
-        try:
-            # Import WeasyPrint
-            from weasyprint import HTML, CSS
-            
-            logger.info(f"Generating PDF from HTML content (length: {len(html_content)})")
-            
-            # Add some default styling for better PDF rendering
-            default_css = CSS(string='''
-                @page {
-                    size: A4;
-                    margin: 2cm;
-                }
-                body {
-                    font-family: Arial, sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.5;
-                    color: #000;
-                }
-                h1 {
-                    font-size: 20pt;
-                    margin-top: 0;
-                    margin-bottom: 0.5em;
-                }
-                h2 {
-                    font-size: 16pt;
-                    margin-top: 1em;
-                    margin-bottom: 0.5em;
-                }
-                h3 {
-                    font-size: 14pt;
-                    margin-top: 0.8em;
-                    margin-bottom: 0.4em;
-                }
-                p {
-                    margin-bottom: 0.5em;
-                }
-                table {
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin-bottom: 1em;
-                }
-                th, td {
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                    text-align: left;
-                }
-                th {
-                    background-color: #f2f2f2;
-                    font-weight: bold;
-                }
-            ''')
-            
-            # Convert HTML to PDF
-            html_obj = HTML(string=html_content)
-            pdf_bytes = html_obj.write_pdf(stylesheets=[default_css])
-            
-            # Create HTTP response with PDF
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            
-            logger.info(f"Successfully generated PDF: {filename}")
-            return response
-            
-        except ImportError:
-            logger.error("WeasyPrint not installed")
+        # WeasyPrint layout is CPU heavy, so rendering runs in a Django-Q task;
+        # the client polls status_url until the file is ready
+        task_id = async_task(
+            'core.tasks.pdf_rendering.render_pdf_task',
+            project_id,
+            html_content,
+            filename,
+            request.user.id
+        )
+        
+        return Response({
+            'task_id': task_id,
+            'status_url': reverse('contracting:contracting-planning-pdf-result', args=[project_id, task_id])
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class ContractingPlanningPDFResultView(generics.GenericAPIView):
+    """
+    Download a PDF rendered by ContractingPlanningPDFView
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, project_id, task_id):
+        """
+        Returns 202 while the PDF is rendering, then the PDF as a downloadable file.
+        """
+        task = fetch(task_id)
+        # Still queued or rendering; unknown and pruned ids are not found
+        args = task.args if task is not None else (queued_task(task_id) or {}).get('args', ())
+        
+        # args are (project_id, html_content, filename, user_id)
+        if len(args) < 4 or args[0] != project_id or args[3] != request.user.id:
             return Response(
-                {'detail': 'PDF generation service not available. WeasyPrint is not installed.'},
+                {'detail': 'PDF not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if task is None:
+            return Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
+        
+        if not task.success:
+            logger.error("PDF rendering task %s failed: %s", task_id, task.result)
+            return Response(
+                {'detail': 'Failed to generate PDF'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
+        
+        result = task.result
+        if not result.get('success'):
             return Response(
-                {'detail': 'Failed to generate PDF', 'error': str(e)},
+                {'detail': 'Failed to generate PDF', 'error': result.get('error')},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        
+        # Rendered files are pruned after an hour (see cleanup_generated_pdfs)
+        if not default_storage.exists(result['path']):
+            return Response(
+                {'detail': 'PDF has expired, please generate it again'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return FileResponse(
+            default_storage.open(result['path'], 'rb'),
+            as_attachment=True,
+            filename=result['filename'],
+            content_type='application/pdf'
+        )
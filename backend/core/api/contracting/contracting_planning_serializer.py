@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from core.models import ContractingPlanning, ContractingPlanningFile
 from .contracting_planning_file_serializer import ContractingPlanningFileSerializer
@@ -6,6 +7,7 @@ from .contracting_planning_file_serializer import ContractingPlanningFileSeriali
 class ContractingPlanningSerializer(serializers.ModelSerializer):
 	"""Serializer for contracting planning with file uploads"""
 	files = ContractingPlanningFileSerializer(many=True, read_only=True)
+	ai_status = serializers.SerializerMethodField()
 	uploaded_files = serializers.ListField(
 		child=serializers.FileField(),
 		write_only=True,
@@ -24,24 +26,25 @@ class ContractingPlanningSerializer(serializers.ModelSerializer):
 			'ai_summary',
 			'ai_questions',
 			'user_answers',
+			'ai_status',
 			'current_step',
 			'created_at',
 			'updated_at'
 		]
-		read_only_fields = ['id', 'created_at', 'updated_at', 'files']
+		read_only_fields = ['id', 'project', 'created_at', 'updated_at', 'files', 'ai_status']
+	
+	def get_ai_status(self, obj):
+		# A job whose worker died or timed out is reported as failed
+		return 'failed' if obj.is_ai_processing_stale() else obj.ai_status
 
 	def create(self, validated_data):
 		"""Create planning with file uploads"""
 		uploaded_files = validated_data.pop('uploaded_files', [])
-		planning = ContractingPlanning.objects.create(**validated_data)
 		
-		# Create file records for each uploaded file
-		for file in uploaded_files:
-			ContractingPlanningFile.objects.create(
-				contracting_planning=planning,
-				file=file,
-				filename=file.name
-			)
+		# Planning and file rows commit together so a failed insert leaves no orphans
+		with transaction.atomic():
+			planning = ContractingPlanning.objects.create(**validated_data)
+			self._create_files(planning, uploaded_files)
 		
 		return planning
 
@@ -55,15 +58,24 @@ class ContractingPlanningSerializer(serializers.ModelSerializer):
 		instance.ai_questions = validated_data.get('ai_questions', instance.ai_questions)
 		instance.user_answers = validated_data.get('user_answers', instance.user_answers)
 		instance.current_step = validated_data.get('current_step', instance.current_step)
-		instance.save()
 		
-		# Add new files if provided
-		for file in uploaded_files:
-			ContractingPlanningFile.objects.create(
-				contracting_planning=instance,
-				file=file,
-				filename=file.name
-			)
+		with transaction.atomic():
+			instance.save()
+			# Add new files if provided
+			self._create_files(instance, uploaded_files)
 		
 		return instance
 
+	@staticmethod
+	def _create_files(planning, uploaded_files):
+		"""Create file records for the uploaded files in a single INSERT"""
+		if not uploaded_files:
+			return
+		ContractingPlanningFile.objects.bulk_create([
+			ContractingPlanningFile(
+				contracting_planning=planning,
+				file=file,
+				filename=file.name
+			)
+			for file in uploaded_files
+		])
@@ -1,14 +1,23 @@
 from rest_framework import generics, permissions
+from rest_framework.pagination import PageNumberPagination
 from core.models import Contractor
 from .contractor_serializer import ContractorSerializer
 
 
+class ContractorPagination(PageNumberPagination):
+	"""50 contractors per page (?page_size= up to 200)"""
+	page_size = 50
+	page_size_query_param = 'page_size'
+	max_page_size = 200
+
+
 class ContractorListView(generics.ListAPIView):
 	"""
 	List contractors with optional filtering
 	"""
 	serializer_class = ContractorSerializer
 	permission_classes = [permissions.IsAuthenticated]
+	pagination_class = ContractorPagination
 
 	def get_queryset(self):
 		return Contractor.objects.all().order_by("-rating", "name")
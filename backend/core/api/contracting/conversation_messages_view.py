@@ -6,15 +6,24 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 
 from core.models import ContractingPlanning, Message, Contractor, MessageAttachment
-from core.services.contracting_service.conversation_agent import ConversationAgent
+from .action_views import _conversation_agent
 from .conversation_serializer import MessageSerializer, MessageActionSerializer
-from django.core.files.base import ContentFile
 
 logger = logging.getLogger(__name__)
 
 
+def _selected_contractor_exists(contractor_id):
+	"""EXISTS subquery: is contractor_id among the outer planning's selected contractors"""
+	return Exists(ContractingPlanning.selected_contractors_m2m.through.objects.filter(
+		contractingplanning_id=OuterRef('pk'),
+		contractor_id=contractor_id
+	))
+
+
 class ConversationMessagesView(APIView):
 	"""
 	GET /contracting/planning/<project_id>/conversations/<contractor_id>/messages/
@@ -28,38 +37,43 @@ class ConversationMessagesView(APIView):
 	def get(self, request, project_id, contractor_id):
 		"""Get all messages for a specific contractor conversation"""
 		try:
-			# Get the contracting planning for this project
-			planning = ContractingPlanning.objects.filter(
-				project_id=project_id,
-				project__user=request.user
-			).first()
-			
-			if not planning:
-				return Response(
-					{'detail': 'Contracting planning not found for this project'},
-					status=status.HTTP_404_NOT_FOUND
-				)
-			
-			# Verify this contractor is in the selected contractors
-			selected_contractor_ids = planning.selected_contractors or []
-			if contractor_id not in selected_contractor_ids:
-				return Response(
-					{'detail': 'Contractor not found in selected contractors'},
-					status=status.HTTP_404_NOT_FOUND
-				)
-			
-			# Get all messages for this contractor
-			messages = Message.objects.filter(
-				contracting_planning=planning,
+			# Messages are scoped to the user's planning and to a selected contractor
+			# through joins, so a non-empty conversation costs one query (actions included)
+			messages = list(Message.objects.select_related('action').filter(
+				contracting_planning__project_id=project_id,
+				contracting_planning__project__user=request.user,
+				contracting_planning__selected_contractors_m2m=contractor_id,
 				contractor_id=contractor_id
-			).order_by('timestamp')
+			).order_by('timestamp'))
+			
+			if not messages:
+				# Empty conversation or no access: only now look at the planning itself
+				is_selected = ContractingPlanning.objects.filter(
+					project_id=project_id,
+					project__user=request.user
+				).annotate(
+					is_selected=_selected_contractor_exists(contractor_id)
+				).values_list('is_selected', flat=True).first()
+				
+				if is_selected is None:
+					return Response(
+						{'detail': 'Contracting planning not found for this project'},
+						status=status.HTTP_404_NOT_FOUND
+					)
+				
+				# Verify this contractor is in the selected contractors
+				if not is_selected:
+					return Response(
+						{'detail': 'Contractor not found in selected contractors'},
+						status=status.HTTP_404_NOT_FOUND
+					)
 			
 			serializer = MessageSerializer(messages, many=True)
 			
 			return Response({'messages': serializer.data})
 			
 		except Exception as e:
-			logger.error(f"Error fetching messages: {str(e)}", exc_info=True)
+			logger.error("Error fetching messages: %s", e, exc_info=True)
 			return Response(
 				{'detail': f'Error fetching messages: {str(e)}'},
 				status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -69,9 +83,11 @@ class ConversationMessagesView(APIView):
 		"""Send a message and get AI response (with optional file attachments)"""
 		try:
 			# Get the contracting planning for this project
-			planning = ContractingPlanning.objects.filter(
+			planning = ContractingPlanning.objects.select_related('project').filter(
 				project_id=project_id,
 				project__user=request.user
+			).annotate(
+				is_selected=_selected_contractor_exists(contractor_id)
 			).first()
 			
 			if not planning:
@@ -81,8 +97,7 @@ class ConversationMessagesView(APIView):
 				)
 			
 			# Verify this contractor is in the selected contractors
-			selected_contractor_ids = planning.selected_contractors or []
-			if contractor_id not in selected_contractor_ids:
+			if not planning.is_selected:
 				return Response(
 					{'detail': 'Contractor not found in selected contractors'},
 					status=status.HTTP_404_NOT_FOUND
@@ -110,33 +125,40 @@ class ConversationMessagesView(APIView):
 				file_names = ', '.join([f.name for f in attachments])
 				display_content = f"{content}\n\n📎 Attached: {file_names}"
 			
-			# Save user message
-			user_message = Message.objects.create(
-				contracting_planning=planning,
-				contractor_id=contractor_id,
-				sender='user',
-				message_type='user',
-				content=display_content
-			)
+			# The user message and its attachments commit together; the agent call
+			# below stays outside so no transaction is held across network I/O
+			with transaction.atomic():
+				# Save user message
+				user_message = Message.objects.create(
+					contracting_planning=planning,
+					contractor_id=contractor_id,
+					sender='user',
+					message_type='user',
+					content=display_content
+				)
 			
-			# Save attachments if any
-			attachment_ids = []
-			if attachments:
-				for attachment in attachments:
-					# Save the file
-					msg_attachment = MessageAttachment.objects.create(
-						message=user_message,
-						file=ContentFile(attachment.read(), name=attachment.name),
-						filename=attachment.name,
-						content_type=attachment.content_type or 'application/octet-stream',
-						file_size=attachment.size
-					)
-					attachment_ids.append(msg_attachment.id)
-					# Reset file pointer for potential reuse
-					attachment.seek(0)
+				# Save attachments if any, in a single INSERT. Storage still copies each
+				# upload in chunks (FileField.pre_save runs for bulk_create too), and no
+				# signal handlers are registered for MessageAttachment.
+				attachment_ids = []
+				if attachments:
+					created = MessageAttachment.objects.bulk_create([
+						MessageAttachment(
+							message=user_message,
+							file=attachment,
+							filename=attachment.name,
+							content_type=attachment.content_type or 'application/octet-stream',
+							file_size=attachment.size
+						)
+						for attachment in attachments
+					])
+					attachment_ids = [msg_attachment.id for msg_attachment in created]
+					# Reset file pointers for potential reuse
+					for attachment in attachments:
+						attachment.seek(0)
 			
 			# Process message with ConversationAgent (pass files to agent)
-			agent = ConversationAgent()
+			agent = _conversation_agent()
 			result = agent.process_user_message(
 				planning,
 				contractor_id,
@@ -191,7 +213,7 @@ class ConversationMessagesView(APIView):
 				)
 			
 		except Exception as e:
-			logger.error(f"Error sending message: {str(e)}", exc_info=True)
+			logger.error("Error sending message: %s", e, exc_info=True)
 			return Response(
 				{'detail': f'Error sending message: {str(e)}'},
 				status=status.HTTP_500_INTERNAL_SERVER_ERROR
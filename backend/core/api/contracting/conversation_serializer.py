@@ -41,3 +41,10 @@ class ConversationListItemSerializer(serializers.Serializer):
 	last_message = serializers.CharField(allow_blank=True)
 	last_message_timestamp = serializers.DateTimeField(allow_null=True)
 	unread_count = serializers.IntegerField(default=0)
+
+
+class ModifyActionInputSerializer(serializers.Serializer):
+	"""Validates the body of a modify-action request"""
+	modifications = serializers.CharField(required=False, allow_blank=True)
+	email_html = serializers.CharField(required=False, allow_blank=True)
+	execute = serializers.BooleanField(default=False)
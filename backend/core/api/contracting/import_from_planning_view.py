@@ -1,12 +1,71 @@
 import logging
+
+import orjson
+
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from core.models import Project, ContractingPlanning
-from core.services.contracting_service.contracting_service import ContractingService
+from django_q.tasks import async_task
+from .contracting_planning_serializer import ContractingPlanningSerializer
 
 logger = logging.getLogger(__name__)
 
+# Import planning_work generator (only GeminiService expected); the view
+# answers 500 instead of failing URL loading when it is unavailable
+try:
+    from core.api.planning_work.services import GeminiService
+except Exception as e:
+    logger.error("Failed to import planning service: %s", e, exc_info=True)
+    GeminiService = None
+
+# Map project fields to planning service inputs
+PROJECT_TYPE_MAP = {
+    'kitchen': ('Kitchen',),
+    'bathroom': ('Bathroom',),
+    'basement': ('Basement',),
+    'roofing': ('Roof',),
+    'electrical': ('Electrical',),
+    'plumbing': ('Plumbing',),
+    'hvac': ('HVAC',),
+    'flooring': ('Flooring',),
+    'windows_doors': ('Windows & Doors',),
+    'exterior': ('Exterior',),
+    'general': ('General Renovation',),
+}
+
+# Sensible defaults for fields the generator requires but projects don't store
+_DEFAULT_BUILDING_SIZE = 100
+_DEFAULT_BUILDING_AGE = '1990-01-01'
+_DEFAULT_TARGET_START_DATE = '2026-01-01'
+_DEFAULT_FINANCING_PREFERENCE = 'personal-savings'
+_DEFAULT_INCENTIVE_INTENT = 'no'
+_DEFAULT_LIVING_DURING_RENOVATION = 'yes'
+_DEFAULT_HERITAGE_PROTECTION = 'no'
+
+
+class _MockGeminiService:
+    """Minimal local mock used only when Gemini isn't available/initialization fails."""
+
+    def generate_renovation_plan(self, *args, **kwargs):
+        # Provide a conservative fallback plan structure so contracting can continue
+        project_summary = {
+            'total_estimated_cost': '€0 - €0',
+            'total_duration': '0-0 months',
+            'funding_readiness': 'Needs Review',
+            'complexity_level': 'Low',
+            'key_considerations': [
+                kwargs.get('dynamic_context', {}).get('note', '') or 'No additional information provided.'
+            ]
+        }
+        return {
+            'success': True,
+            'plan': {
+                'project_summary': project_summary,
+                'ai_questions': [],
+            }
+        }
+
 
 class ImportFromPlanningView(APIView):
     """Import planning data from the Planning module (generate or fetch a plan)
@@ -25,82 +84,33 @@ class ImportFromPlanningView(APIView):
         except Project.DoesNotExist:
             return Response({'detail': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        # Import planning_work generator (only GeminiService expected)
-        try:
-            from core.api.planning_work.services import GeminiService
-        except Exception as e:
-            logger.error(f"Failed to import planning service: {e}", exc_info=True)
+        if GeminiService is None:
             return Response({'detail': 'Planning service unavailable'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # Choose service: try to instantiate GeminiService; if it fails, use a light-weight local Mock
         try:
             planning_service = GeminiService()
         except Exception:
-            # Minimal local mock used only when Gemini isn't available/initialization fails.
-            class MockGeminiServiceLocal:
-                def generate_renovation_plan(self, *args, **kwargs):
-                    # Provide a conservative fallback plan structure so contracting can continue
-                    project_summary = {
-                        'total_estimated_cost': '€0 - €0',
-                        'total_duration': '0-0 months',
-                        'funding_readiness': 'Needs Review',
-                        'complexity_level': 'Low',
-                        'key_considerations': [
-                            kwargs.get('dynamic_context', {}).get('note', '') or 'No additional information provided.'
-                        ]
-                    }
-                    return {
-                        'success': True,
-                        'plan': {
-                            'project_summary': project_summary,
-                            'ai_questions': [],
-                        }
-                    }
-
-            planning_service = MockGeminiServiceLocal()
-
-        # Map project fields to planning service inputs
-        project_type_map = {
-            'kitchen': ['Kitchen'],
-            'bathroom': ['Bathroom'],
-            'basement': ['Basement'],
-            'roofing': ['Roof'],
-            'electrical': ['Electrical'],
-            'plumbing': ['Plumbing'],
-            'hvac': ['HVAC'],
-            'flooring': ['Flooring'],
-            'windows_doors': ['Windows & Doors'],
-            'exterior': ['Exterior'],
-            'general': ['General Renovation'],
-        }
-
-        renovation_goals = project_type_map.get(project.project_type, ['General Renovation'])
+            planning_service = _MockGeminiService()
 
-        # Provide sensible defaults for missing fields required by generator
-        building_size = 100
-        building_age = '1990-01-01'
-        target_start_date = '2026-01-01'
-        financing_preference = 'personal-savings'
-        incentive_intent = 'no'
-        living_during_renovation = 'yes'
-        heritage_protection = 'no'
+        renovation_goals = list(PROJECT_TYPE_MAP.get(project.project_type, ('General Renovation',)))
 
         try:
             result = planning_service.generate_renovation_plan(
                 building_type=project.project_type,
                 budget=float(project.budget or 0),
                 location=project.state or project.city,
-                building_size=building_size,
+                building_size=_DEFAULT_BUILDING_SIZE,
                 renovation_goals=renovation_goals,
-                building_age=building_age,
-                target_start_date=target_start_date,
-                financing_preference=financing_preference,
-                incentive_intent=incentive_intent,
-                living_during_renovation=living_during_renovation,
-                heritage_protection=heritage_protection,
+                building_age=_DEFAULT_BUILDING_AGE,
+                target_start_date=_DEFAULT_TARGET_START_DATE,
+                financing_preference=_DEFAULT_FINANCING_PREFERENCE,
+                incentive_intent=_DEFAULT_INCENTIVE_INTENT,
+                living_during_renovation=_DEFAULT_LIVING_DURING_RENOVATION,
+                heritage_protection=_DEFAULT_HERITAGE_PROTECTION,
             )
         except Exception as e:
-            logger.error(f"Planning generation failed: {e}", exc_info=True)
+            logger.error("Planning generation failed: %s", e, exc_info=True)
             return Response({'detail': 'Failed to generate planning'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # Create or update ContractingPlanning for this project
@@ -115,12 +125,10 @@ class ImportFromPlanningView(APIView):
                 description_text = '\n'.join(key_considerations) if key_considerations else project.additional_information or ''
                 planning_obj.description = description_text or planning_obj.description or ''
 
-                # Store AI summary as JSON string of project_summary for now
-                try:
-                    import json as _json
-                    planning_obj.ai_summary = _json.dumps(project_summary)
-                except Exception:
-                    planning_obj.ai_summary = str(project_summary)
+                # Store AI summary as JSON string of project_summary for now; the
+                # column is text shown verbatim in the UI and prompts, so it stays
+                # a string. Values orjson can't encode fall back to str().
+                planning_obj.ai_summary = orjson.dumps(project_summary, default=str).decode()
 
                 # No AI questions generated by planning_work; leave empty
                 planning_obj.ai_questions = plan_data.get('ai_questions') if plan_data.get('ai_questions') else []
@@ -128,27 +136,18 @@ class ImportFromPlanningView(APIView):
                 # Fallback to using project additional_information
                 planning_obj.description = project.additional_information or planning_obj.description or ''
 
-            planning_obj.save()
-
-            # Post-process with ContractingService to generate AI summary/questions
-            try:
-                contracting_service = ContractingService()
-                ai_result = contracting_service.process_planning_with_ai(planning_obj)
-
-                # If the service returned a better summary/questions, persist them
-                if ai_result.get('summary'):
-                    planning_obj.ai_summary = ai_result.get('summary')
-                if ai_result.get('questions') is not None:
-                    planning_obj.ai_questions = ai_result.get('questions')
+            # Post-processing with ContractingService (Gemini summary/questions) runs
+            # in a Django-Q task; clients poll the detail view until ai_status
+            # leaves 'processing'
+            planning_obj.ai_status = 'processing'
+            planning_obj.save(update_fields=['description', 'ai_summary', 'ai_questions', 'ai_status', 'updated_at'])
+            async_task('core.tasks.planning_ai.process_planning_with_ai_task', planning_obj.id)
+            logger.info("Queued AI post-processing for imported planning %s", planning_obj.id)
 
-                planning_obj.save()
-            except Exception as e:
-                logger.warning(f"ContractingService post-processing failed: {e}")
             # Serialize response using existing serializer
-            from .contracting_planning_serializer import ContractingPlanningSerializer
             serializer = ContractingPlanningSerializer(planning_obj)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
         except Exception as e:
-            logger.error(f"Failed to save ContractingPlanning: {e}", exc_info=True)
+            logger.error("Failed to save ContractingPlanning: %s", e, exc_info=True)
             return Response({'detail': 'Failed to import planning data'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
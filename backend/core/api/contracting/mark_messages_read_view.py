@@ -8,7 +8,8 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
-from core.models import ContractingPlanning, Message
+from core.models import Message
+from .planning_lookup import get_planning_id_for_user
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +25,10 @@ class MarkMessagesReadView(APIView):
 	def post(self, request, project_id, contractor_id):
 		"""Mark all messages in a conversation as read"""
 		try:
-			# Get the contracting planning for this project
-			planning = ContractingPlanning.objects.filter(
-				project_id=project_id,
-				project__user=request.user
-			).first()
+			# Get the contracting planning id for this project, owner-checked
+			planning_id = get_planning_id_for_user(project_id, request.user)
 			
-			if not planning:
+			if planning_id is None:
 				return Response(
 					{'detail': 'Contracting planning not found for this project'},
 					status=status.HTTP_404_NOT_FOUND
@@ -38,7 +36,7 @@ class MarkMessagesReadView(APIView):
 			
 			# # Mark all unread messages in this conversation as read
 			# updated_count = Message.objects.filter(
-			# 	contracting_planning=planning,
+			# 	contracting_planning_id=planning_id,
 			# 	contractor_id=contractor_id,
 			# 	is_read=False
 			# ).update(is_read=True, read_at=timezone.now())
@@ -48,7 +46,7 @@ class MarkMessagesReadView(APIView):
 			})
 			
 		except Exception as e:
-			logger.error(f"Error marking messages as read: {str(e)}", exc_info=True)
+			logger.error("Error marking messages as read: %s", e, exc_info=True)
 			return Response(
 				{'detail': f'Error marking messages as read: {str(e)}'},
 				status=status.HTTP_500_INTERNAL_SERVER_ERROR
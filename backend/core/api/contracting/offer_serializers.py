@@ -2,7 +2,13 @@
 Offer Serializers - Serialize offer and analysis data
 """
 from rest_framework import serializers
-from core.models import ContractorOffer, OfferAnalysis
+from core.models import Contractor, ContractorOffer, OfferAnalysis
+
+
+def contractor_names_for(offers):
+    """Map contractor id -> name for the given offers with a single query"""
+    contractor_ids = {offer.contractor_id for offer in offers}
+    return dict(Contractor.objects.filter(id__in=contractor_ids).values_list('id', 'name'))
 
 
 class OfferSerializer(serializers.ModelSerializer):
@@ -41,13 +47,28 @@ class OfferSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_contractor_name(self, obj):
-        """Get contractor name"""
-        try:
-            from core.models import Contractor
-            contractor = Contractor.objects.get(id=obj.contractor_id)
-            return contractor.name
-        except:
-            return f"Contractor {obj.contractor_id}"
+        """
+        Get contractor name from the 'contractor_names' context map (see
+        contractor_names_for), so serializing many offers costs no extra queries
+        """
+        name = self.context.get('contractor_names', {}).get(obj.contractor_id)
+        return name or f"Contractor {obj.contractor_id}"
+
+
+class OfferListSerializer(OfferSerializer):
+    """Light variant of OfferSerializer for list views; no JSON/text blob fields"""
+    
+    class Meta(OfferSerializer.Meta):
+        fields = [
+            'id',
+            'contractor_id',
+            'contractor_name',
+            'total_price',
+            'currency',
+            'timeline_start',
+            'timeline_end',
+            'created_at'
+        ]
 
 
 class OfferAnalysisSerializer(serializers.ModelSerializer):
@@ -75,8 +96,17 @@ class OfferAnalysisSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_compared_offers_details(self, obj):
-        """Get details of compared offers"""
+        """
+        Get details of compared offers, from the 'compared_offers_map' context
+        (id -> offer) when the view has already loaded them
+        """
         if obj.analysis_type == 'comparison' and obj.compared_offer_ids:
-            compared_offers = ContractorOffer.objects.filter(id__in=obj.compared_offer_ids)
-            return OfferSerializer(compared_offers, many=True).data
+            offers_map = self.context.get('compared_offers_map')
+            if offers_map is None:
+                compared_offers = list(ContractorOffer.objects.filter(id__in=obj.compared_offer_ids))
+                context = {**self.context, 'contractor_names': contractor_names_for(compared_offers)}
+            else:
+                compared_offers = [offers_map[offer_id] for offer_id in obj.compared_offer_ids if offer_id in offers_map]
+                context = self.context
+            return OfferSerializer(compared_offers, many=True, context=context).data
         return []
@@ -2,54 +2,126 @@
 Offer Views - Handle offer listing, analysis, and comparison operations
 """
 import logging
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import LimitOffsetPagination
 
 from core.models import ContractingPlanning, ContractorOffer, OfferAnalysis
 from core.services.contracting_service.offer_service import OfferService
-from .offer_serializers import OfferSerializer, OfferAnalysisSerializer
+from .planning_lookup import get_planning_id_for_user
+from .offer_serializers import OfferSerializer, OfferListSerializer, OfferAnalysisSerializer, contractor_names_for
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_CACHE_TIMEOUT = 3600
+
+
+@lru_cache(maxsize=1)
+def _offer_service():
+    """Shared OfferService; it holds no per-request state."""
+    return OfferService()
+
+
+def _offers_etag(request, project_id, offer_id=None):
+    """
+    ETag for the user's offers on a project (or a single offer): the count and
+    latest updated_at change on every create, update and delete, so a matching
+    If-None-Match gets a 304 without serializing anything
+    """
+    offers = ContractorOffer.objects.filter(
+        contracting_planning__project_id=project_id,
+        contracting_planning__project__user=request.user
+    )
+    if offer_id is not None:
+        offers = offers.filter(id=offer_id)
+    stats = offers.aggregate(total=Count('id'), latest=Max('updated_at'))
+    if not stats['total']:
+        return None
+    return f"{stats['total']}-{stats['latest'].timestamp()}"
+
+
+def _get_user_offer(user, project_id, offer_id, select_related=(), only=()):
+    """
+    Return offer_id if it belongs to user's project_id, else None.
+
+    Ownership is checked through the planning and project joins in the WHERE
+    clause; select_related and only are for callers that read the planning or
+    need just a few columns.
+    """
+    offers = ContractorOffer.objects.select_related(*select_related)
+    if only:
+        offers = offers.only(*only)
+    return offers.filter(
+        id=offer_id,
+        contracting_planning__project_id=project_id,
+        contracting_planning__project__user=user
+    ).first()
+
+
+class OfferPagination(LimitOffsetPagination):
+    """20 offers per page by default (?limit= up to 100, ?offset=)"""
+    default_limit = 20
+    max_limit = 100
+
 
 class OfferListView(APIView):
     """
     GET /api/projects/<project_id>/contracting/offers/
-    List all offers for a project
+    List offers for a project, newest first and paginated; full offer data
+    is served by OfferDetailView
     """
     permission_classes = [IsAuthenticated]
     
+    @method_decorator(condition(etag_func=_offers_etag))
     def get(self, request, project_id):
         """List all offers for the project"""
         try:
-            # Verify the planning belongs to the user
-            planning = ContractingPlanning.objects.filter(
-                project_id=project_id,
-                project__user=request.user
-            ).first()
+            # Verify the planning belongs to the user (id only)
+            planning_id = get_planning_id_for_user(project_id, request.user)
             
-            if not planning:
+            if planning_id is None:
                 return Response(
                     {'detail': 'Contracting planning not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Get all offers for this planning
-            offers = ContractorOffer.objects.filter(
-                contracting_planning=planning
-            ).order_by('-created_at')
+            # Page through the offers for this planning, loading only the list columns
+            paginator = OfferPagination()
+            offers = paginator.paginate_queryset(
+                ContractorOffer.objects.filter(
+                    contracting_planning_id=planning_id
+                ).only(
+                    'id', 'contractor_id', 'total_price', 'currency',
+                    'timeline_start', 'timeline_end', 'created_at'
+                ).order_by('-created_at'),
+                request,
+                view=self
+            )
             
-            serializer = OfferSerializer(offers, many=True)
+            # Contractor names for every offer in one query
+            serializer = OfferListSerializer(
+                offers,
+                many=True,
+                context={'contractor_names': contractor_names_for(offers)}
+            )
             
             return Response({
                 'offers': serializer.data,
-                'total': offers.count()
+                'total': paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link()
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error listing offers: {str(e)}", exc_info=True)
+            logger.error("Error listing offers: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error listing offers: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -63,15 +135,12 @@ class OfferDetailView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    @method_decorator(condition(etag_func=_offers_etag))
     def get(self, request, project_id, offer_id):
         """Get offer details"""
         try:
-            # Verify the offer belongs to the user
-            offer = ContractorOffer.objects.select_related('contracting_planning__project').filter(
-                id=offer_id,
-                contracting_planning__project_id=project_id,
-                contracting_planning__project__user=request.user
-            ).first()
+            # Verify the offer belongs to the user; no planning or project fields are serialized
+            offer = _get_user_offer(request.user, project_id, offer_id)
             
             if not offer:
                 return Response(
@@ -79,12 +148,15 @@ class OfferDetailView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = OfferSerializer(offer)
+            serializer = OfferSerializer(
+                offer,
+                context={'contractor_names': contractor_names_for([offer])}
+            )
             
             return Response(serializer.data, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error getting offer details: {str(e)}", exc_info=True)
+            logger.error("Error getting offer details: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error getting offer details: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -102,11 +174,10 @@ class AnalyzeOfferView(APIView):
         """Analyze an offer"""
         try:
             # Verify the offer belongs to the user
-            offer = ContractorOffer.objects.select_related('contracting_planning__project').filter(
-                id=offer_id,
-                contracting_planning__project_id=project_id,
-                contracting_planning__project__user=request.user
-            ).first()
+            offer = _get_user_offer(
+                request.user, project_id, offer_id,
+                select_related=('contracting_planning__project',)
+            )
             
             if not offer:
                 return Response(
@@ -114,16 +185,22 @@ class AnalyzeOfferView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Generate analysis
-            offer_service = OfferService()
+            # The contractor name is looked up once, for both the prompt and the response
+            contractor_names = contractor_names_for([offer])
+            
+            # Generate analysis; the planning and project were joined in above
+            offer_service = _offer_service()
             analysis = offer_service.analyze_single_offer(
                 offer=offer,
-                planning=offer.contracting_planning
+                planning=offer.contracting_planning,
+                contractor_name=contractor_names.get(offer.contractor_id)
             )
             
-            # Serialize the analysis
-            analysis_serializer = OfferAnalysisSerializer(analysis)
-            offer_serializer = OfferSerializer(offer)
+            # Serialize the analysis; it was created with this offer instance, so
+            # analysis.offer needs no query either
+            context = {'contractor_names': contractor_names}
+            analysis_serializer = OfferAnalysisSerializer(analysis, context=context)
+            offer_serializer = OfferSerializer(offer, context=context)
             
             return Response({
                 'success': True,
@@ -132,7 +209,7 @@ class AnalyzeOfferView(APIView):
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error analyzing offer: {str(e)}", exc_info=True)
+            logger.error("Error analyzing offer: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error analyzing offer: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -165,11 +242,10 @@ class CompareOffersView(APIView):
                 )
             
             # Verify the primary offer belongs to the user
-            primary_offer = ContractorOffer.objects.select_related('contracting_planning__project').filter(
-                id=primary_offer_id,
-                contracting_planning__project_id=project_id,
-                contracting_planning__project__user=request.user
-            ).first()
+            primary_offer = _get_user_offer(
+                request.user, project_id, primary_offer_id,
+                select_related=('contracting_planning__project',)
+            )
             
             if not primary_offer:
                 return Response(
@@ -180,37 +256,42 @@ class CompareOffersView(APIView):
             # Get comparison offers if specified
             comparison_offers = None
             if compare_with_ids:
-                comparison_offers = list(
-                    ContractorOffer.objects.filter(
-                        id__in=compare_with_ids,
-                        contracting_planning=primary_offer.contracting_planning
-                    )
+                comparison_qs = ContractorOffer.objects.filter(
+                    id__in=compare_with_ids,
+                    contracting_planning_id=primary_offer.contracting_planning_id
                 )
                 
-                if len(comparison_offers) != len(compare_with_ids):
+                # Count first so a request that will be rejected never loads offer rows
+                if comparison_qs.count() != len(compare_with_ids):
                     return Response(
                         {'detail': 'Some comparison offers not found or do not belong to this project'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
+                
+                comparison_offers = list(comparison_qs)
             
             # Generate comparison
-            offer_service = OfferService()
+            offer_service = _offer_service()
             comparison = offer_service.compare_offers(
                 primary_offer=primary_offer,
                 comparison_offers=comparison_offers
             )
             
-            # Serialize the comparison
-            comparison_serializer = OfferAnalysisSerializer(comparison)
-            primary_offer_serializer = OfferSerializer(primary_offer)
-            
             # Get all compared offers
             all_compared_offers = []
             if comparison.compared_offer_ids:
-                all_compared_offers = ContractorOffer.objects.filter(
+                all_compared_offers = list(ContractorOffer.objects.filter(
                     id__in=comparison.compared_offer_ids
-                )
-            compared_offers_serializer = OfferSerializer(all_compared_offers, many=True)
+                ))
+            
+            # Serialize the comparison; contractor names for every offer come from one query
+            context = {
+                'contractor_names': contractor_names_for([primary_offer, *all_compared_offers]),
+                'compared_offers_map': {offer.id: offer for offer in all_compared_offers}
+            }
+            comparison_serializer = OfferAnalysisSerializer(comparison, context=context)
+            primary_offer_serializer = OfferSerializer(primary_offer, context=context)
+            compared_offers_serializer = OfferSerializer(all_compared_offers, many=True, context=context)
             
             return Response({
                 'success': True,
@@ -220,7 +301,7 @@ class CompareOffersView(APIView):
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error comparing offers: {str(e)}", exc_info=True)
+            logger.error("Error comparing offers: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error comparing offers: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -237,12 +318,12 @@ class OfferAnalysisDetailView(APIView):
     def get(self, request, project_id, offer_id):
         """Get offer analysis"""
         try:
-            # Verify the offer belongs to the user
-            offer = ContractorOffer.objects.select_related('contracting_planning__project').filter(
-                id=offer_id,
-                contracting_planning__project_id=project_id,
-                contracting_planning__project__user=request.user
-            ).first()
+            # Verify the offer belongs to the user; only its id and contractor are
+            # needed here, the full offer comes joined with the analysis below
+            offer = _get_user_offer(
+                request.user, project_id, offer_id,
+                only=('id', 'contractor_id')
+            )
             
             if not offer:
                 return Response(
@@ -251,8 +332,8 @@ class OfferAnalysisDetailView(APIView):
                 )
             
             # Get the most recent analysis
-            analysis = OfferAnalysis.objects.filter(
-                offer=offer
+            analysis = OfferAnalysis.objects.select_related('offer').filter(
+                offer_id=offer.id
             ).order_by('-created_at').first()
             
             if not analysis:
@@ -261,12 +342,15 @@ class OfferAnalysisDetailView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = OfferAnalysisSerializer(analysis)
+            serializer = OfferAnalysisSerializer(
+                analysis,
+                context={'contractor_names': contractor_names_for([offer])}
+            )
             
             return Response(serializer.data, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error getting offer analysis: {str(e)}", exc_info=True)
+            logger.error("Error getting offer analysis: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error getting offer analysis: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -302,10 +386,11 @@ class StructuredComparisonView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Check if there are enough offers
-            offer_count = ContractorOffer.objects.filter(
+            # Check if there are enough offers; the same aggregate versions the cache key
+            offer_stats = ContractorOffer.objects.filter(
                 contracting_planning=planning
-            ).count()
+            ).aggregate(total=Count('id'), latest=Max('updated_at'))
+            offer_count = offer_stats['total']
             
             if offer_count < 2:
                 return Response(
@@ -313,20 +398,29 @@ class StructuredComparisonView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Generate structured comparison
-            offer_service = OfferService()
-            dashboard_data = offer_service.generate_structured_comparison(planning)
+            # The dashboard is an LLM pass over the planning and its offers, so it is
+            # reused until any of them changes
+            cache_key = (
+                f"dash:{planning.id}:{planning.updated_at.timestamp()}:"
+                f"{offer_count}:{offer_stats['latest'].timestamp()}"
+            )
+            dashboard_data = cache.get(cache_key)
+            if dashboard_data is None:
+                # Generate structured comparison
+                offer_service = _offer_service()
+                dashboard_data = offer_service.generate_structured_comparison(planning)
+                cache.set(cache_key, dashboard_data, DASHBOARD_CACHE_TIMEOUT)
             
             return Response(dashboard_data, status=status.HTTP_200_OK)
         
         except ValueError as e:
-            logger.warning(f"Validation error in structured comparison: {str(e)}")
+            logger.warning("Validation error in structured comparison: %s", e)
             return Response(
                 {'detail': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error generating structured comparison: {str(e)}", exc_info=True)
+            logger.error("Error generating structured comparison: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error generating comparison: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -344,9 +438,7 @@ class AnalysisDetailView(APIView):
         """Get analysis by ID"""
         try:
             # Get the analysis and verify it belongs to the user's project
-            analysis = OfferAnalysis.objects.select_related(
-                'offer__contracting_planning__project'
-            ).filter(
+            analysis = OfferAnalysis.objects.select_related('offer').filter(
                 id=analysis_id,
                 offer__contracting_planning__project_id=project_id,
                 offer__contracting_planning__project__user=request.user
@@ -358,12 +450,15 @@ class AnalysisDetailView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = OfferAnalysisSerializer(analysis)
+            serializer = OfferAnalysisSerializer(
+                analysis,
+                context={'contractor_names': contractor_names_for([analysis.offer])}
+            )
             
             return Response(serializer.data, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Error retrieving analysis: {str(e)}", exc_info=True)
+            logger.error("Error retrieving analysis: %s", e, exc_info=True)
             return Response(
                 {'detail': f'Error retrieving analysis: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,45 @@
+"""
+Planning Lookup - Load a project's contracting planning scoped to its owner
+"""
+from rest_framework.exceptions import NotFound
+
+from core.models import ContractingPlanning, Project
+
+
+def get_planning_for_user(project_id, user, select_related=('project',), prefetch_related=(), defer=()):
+    """
+    Return the ContractingPlanning of project_id in a single query, joined
+    through the project so ownership is checked in the same WHERE clause.
+
+    defer names planning columns the caller never reads, so large JSON/text
+    blobs are not loaded for nothing.
+
+    Raises NotFound (404) when there is no match; only then is the project
+    looked up again, to tell a foreign project from a missing planning.
+    """
+    planning = ContractingPlanning.objects.select_related(*select_related).prefetch_related(
+        *prefetch_related
+    ).defer(*defer).filter(
+        project_id=project_id,
+        project__user=user
+    ).first()
+
+    if planning is None:
+        if not Project.objects.filter(id=project_id, user=user).exists():
+            raise NotFound('Project not found or you do not have permission to access it')
+        raise NotFound('Contracting planning not found. Please complete the planning step first.')
+
+    return planning
+
+
+def get_planning_id_for_user(project_id, user):
+    """
+    Return the id of project_id's planning if the project belongs to user, else None.
+
+    For views that only need the id: a single indexed lookup with the
+    ownership check in the WHERE clause, no model instance built.
+    """
+    return ContractingPlanning.objects.filter(
+        project_id=project_id,
+        project__user=user
+    ).values_list('id', flat=True).first()
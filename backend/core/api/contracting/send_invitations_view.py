@@ -2,61 +2,46 @@
 Send Invitations View - Send invitation emails to contractors via Gmail
 """
 import logging
-import io
-from django.http import HttpResponse
+from django_q.tasks import async_task, fetch
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
-from django.utils import timezone
-from core.models import Project, ContractingPlanning, Contractor, SentEmail, EmailCredential, Message
+from core.models import Contractor, SentEmail, EmailCredential
 from core.services.gmail_service import GmailService
+from core.tasks.queue import queued_task
+from .planning_lookup import get_planning_for_user
 
 logger = logging.getLogger(__name__)
 
 
 class SendInvitationsView(generics.GenericAPIView):
 	"""
-	Send invitation emails to selected contractors via Gmail API.
+	Queue invitation emails to selected contractors via Gmail API.
 	"""
 	permission_classes = [permissions.IsAuthenticated]
 	parser_classes = [JSONParser]
 	
 	def post(self, request, project_id):
 		"""
-		Send invitation emails to contractors.
+		Queue invitation emails to contractors.
 		
 		Request body:
 		{
 			"contractor_ids": [1, 2, 3],
 			"email_html": "<html>...</html>",
+			"renovation_plan_html": "<html>...</html>" (optional, attached as PDF),
 			"attachment_file_ids": [1, 2] (optional, IDs of ContractingPlanningFile)
 		}
 		
-		Returns: 
+		Returns 202:
 		{
-			"success": 2,
-			"failed": 0,
-			"errors": [],
-			"sent_emails": [...]
+			"task_id": "...",
+			"sent_emails": [{"id": 1, "contractor_id": 1, ..., "status": "pending"}]
 		}
 		"""
-		# Verify the project exists and belongs to the user
-		try:
-			project = Project.objects.get(id=project_id, user=request.user)
-		except Project.DoesNotExist:
-			return Response(
-				{'detail': 'Project not found or you do not have permission to access it'},
-				status=status.HTTP_404_NOT_FOUND
-			)
-		
-		# Get contracting planning
-		try:
-			planning = ContractingPlanning.objects.get(project=project)
-		except ContractingPlanning.DoesNotExist:
-			return Response(
-				{'detail': 'Contracting planning not found for this project'},
-				status=status.HTTP_404_NOT_FOUND
-			)
+		# Planning and project in one query; the project must belong to the user
+		planning = get_planning_for_user(project_id, request.user)
+		project = planning.project
 		
 		# Validate user has Gmail authentication
 		try:
@@ -71,9 +56,9 @@ class SendInvitationsView(generics.GenericAPIView):
 						credential.access_token = token_data['access_token']
 						credential.token_expiry = token_data['token_expiry']
 						credential.save()
-						logger.info(f"Successfully refreshed Gmail token for user {request.user.id}")
+						logger.info("Successfully refreshed Gmail token for user %s", request.user.id)
 					except Exception as e:
-						logger.error(f"Failed to refresh Gmail token: {str(e)}")
+						logger.error("Failed to refresh Gmail token: %s", e)
 						return Response(
 							{'detail': 'Gmail authentication expired. Please reconnect your Gmail account.'},
 							status=status.HTTP_401_UNAUTHORIZED
@@ -106,222 +91,88 @@ class SendInvitationsView(generics.GenericAPIView):
 				status=status.HTTP_400_BAD_REQUEST
 			)
 		
-		# Get contractors
-		contractors = Contractor.objects.filter(id__in=contractor_ids)
+		# Get contractors; only the columns the invitation uses
+		contractors = list(Contractor.objects.filter(id__in=contractor_ids).only('id', 'name', 'email'))
 		
-		if not contractors.exists():
+		if not contractors:
 			return Response(
 				{'detail': 'No valid contractors found'},
 				status=status.HTTP_400_BAD_REQUEST
 			)
 		
-		# Generate PDF from renovation plan HTML
-		pdf_bytes = None
-		pdf_filename = f"Renovation_Plan_{project.name.replace(' ', '_')}.pdf"
-		
-		# Get renovation plan HTML from the latest invitation generation
-		# We'll use the existing PDF generation logic
-		try:
-			from weasyprint import HTML, CSS
-			
-			# Get the renovation plan HTML - we need to fetch it
-			# For now, let's assume it's passed or we generate it
-			renovation_plan_html = request.data.get('renovation_plan_html', '')
-			
-			if renovation_plan_html:
-				logger.info(f"Generating PDF for project {project_id}")
-				
-				default_css = CSS(string='''
-					@page {
-						size: A4;
-						margin: 2cm;
-					}
-					body {
-						font-family: Arial, sans-serif;
-						font-size: 11pt;
-						line-height: 1.5;
-						color: #000;
-					}
-					h1 { font-size: 20pt; margin-top: 0; margin-bottom: 0.5em; }
-					h2 { font-size: 16pt; margin-top: 1em; margin-bottom: 0.5em; }
-					h3 { font-size: 14pt; margin-top: 0.8em; margin-bottom: 0.4em; }
-					p { margin-bottom: 0.5em; }
-				''')
-				
-				html_obj = HTML(string=renovation_plan_html)
-				pdf_bytes = html_obj.write_pdf(stylesheets=[default_css])
-				logger.info(f"Successfully generated PDF ({len(pdf_bytes)} bytes)")
-		except ImportError:
-			logger.warning("WeasyPrint not installed, PDF will not be attached")
-		except Exception as e:
-			logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
-		
-		# Prepare attachments list
-		attachments = []
-		
-		# Add PDF if generated
-		if pdf_bytes:
-			attachments.append({
-				'filename': pdf_filename,
-				'content': pdf_bytes,
-				'content_type': 'application/pdf'
-			})
-		
-		# Add user-selected files
-		if attachment_file_ids:
-			planning_files = planning.files.filter(id__in=attachment_file_ids)
-			for file_obj in planning_files:
-				try:
-					with file_obj.file.open('rb') as f:
-						file_content = f.read()
-						attachments.append({
-							'filename': file_obj.filename,
-							'content': file_content,
-						})
-					logger.info(f"Added attachment: {file_obj.filename}")
-				except Exception as e:
-					logger.error(f"Failed to read file {file_obj.filename}: {str(e)}")
-		
 		# Email subject
 		subject = f"Invitation: {project.name} Renovation Project"
 		
-		# Send emails to contractors
-		results = {
-			'success': 0,
-			'failed': 0,
-			'errors': [],
-			'sent_emails': []
-		}
-		
-		access_token = credential.access_token
-		
-		for contractor in contractors:
-			if not contractor.email:
-				results['failed'] += 1
-				results['errors'].append({
-					'contractor_id': contractor.id,
-					'contractor_name': contractor.name,
-					'error': 'No email address available'
-				})
-				
-				# Create failed SentEmail record
-				SentEmail.objects.create(
-					contracting_planning=planning,
-					contractor_email='',
-					subject=subject,
-					body_html=email_html,
-					status='failed',
-					error_message='No email address available'
-				)
-				continue
-			
-			try:
-				# Send email via Gmail
-				result = GmailService.send_email(
-					access_token=access_token,
-					to=contractor.email,
-					subject=subject,
-					body=self._html_to_plain_text(email_html),
-					html_body=email_html,
-					attachments=attachments
-				)
-				
-				# Create successful SentEmail record
-				sent_email = SentEmail.objects.create(
-					contracting_planning=planning,
-					contractor_email=contractor.email,
-					subject=subject,
-					body_html=email_html,
-					status='sent',
-					gmail_message_id=result.get('message_id'),
-					gmail_thread_id=result.get('thread_id')
-				)
-				
-				results['success'] += 1
-				results['sent_emails'].append({
+		# One pending SentEmail per contractor; the task marks each sent or failed
+		sent_emails = SentEmail.objects.bulk_create([
+			SentEmail(
+				contracting_planning=planning,
+				contractor_email=contractor.email or '',
+				subject=subject,
+				body_html=email_html,
+				status='pending'
+			)
+			for contractor in contractors
+		])
+		
+		# PDF rendering and the Gmail round trips run in a Django-Q task;
+		# clients poll SendInvitationsResultView with the task id
+		task_id = async_task(
+			'core.tasks.send_invitations.send_invitations_task',
+			project_id,
+			request.user.id,
+			planning.id,
+			[(sent_email.id, contractor.id) for sent_email, contractor in zip(sent_emails, contractors)],
+			request.data.get('renovation_plan_html', ''),
+			attachment_file_ids,
+		)
+		logger.info("Queued %s invitation(s) for project %s", len(contractors), project_id)
+		
+		return Response({
+			'task_id': task_id,
+			'sent_emails': [
+				{
 					'id': sent_email.id,
 					'contractor_id': contractor.id,
 					'contractor_name': contractor.name,
 					'contractor_email': contractor.email,
-					'message_id': result.get('message_id')
-				})
-				
-				logger.info(f"Successfully sent email to {contractor.email} (message_id: {result.get('message_id')})")
-				
-			except Exception as e:
-				logger.error(f"Failed to send email to {contractor.email}: {str(e)}", exc_info=True)
-				
-				results['failed'] += 1
-				results['errors'].append({
-					'contractor_id': contractor.id,
-					'contractor_name': contractor.name,
-					'error': str(e)
-				})
-				
-				# Create failed SentEmail record
-				SentEmail.objects.create(
-					contracting_planning=planning,
-					contractor_email=contractor.email,
-					subject=subject,
-					body_html=email_html,
-					status='failed',
-					error_message=str(e)
-				)
-		
-		logger.info(f"Email sending complete: {results['success']} succeeded, {results['failed']} failed")
+					'status': sent_email.status
+				}
+				for sent_email, contractor in zip(sent_emails, contractors)
+			]
+		}, status=status.HTTP_202_ACCEPTED)
+
+
+class SendInvitationsResultView(generics.GenericAPIView):
+	"""
+	Outcome of an invitation batch queued by SendInvitationsView
+	"""
+	permission_classes = [permissions.IsAuthenticated]
+	
+	def get(self, request, project_id, task_id):
+		"""
+		Returns 202 while emails are being sent, then the per-contractor results:
+		{"success": 2, "failed": 0, "errors": [], "sent_emails": [...]}
+		"""
+		task = fetch(task_id)
+		# Still queued or sending; unknown and pruned ids are not found
+		args = task.args if task is not None else (queued_task(task_id) or {}).get('args', ())
 		
-		# Create initial welcome messages for successfully contacted contractors
-		for sent_email_info in results['sent_emails']:
-			contractor_id = sent_email_info['contractor_id']
-			contractor_name = sent_email_info['contractor_name']
-			
-			# Check if a welcome message already exists for this contractor
-			existing_message = Message.objects.filter(
-				contracting_planning=planning,
-				contractor_id=contractor_id,
-				sender='ai'
-			).first()
-			
-			if not existing_message:
-				# Create initial AI welcome message
-				welcome_message = (
-					f"Hello! I'm your AI agent helping you communicate with {contractor_name}. "
-					f"I'll facilitate your conversation and help clarify any questions you have about "
-					f"your renovation project. Feel free to ask me anything!"
-				)
-				
-				Message.objects.create(
-					contracting_planning=planning,
-					contractor_id=contractor_id,
-					sender='ai',
-					content=welcome_message,
-                )
-				logger.info(f"Created initial welcome message for contractor {contractor_id}")
+		# args start with (project_id, user_id, ...)
+		if len(args) < 2 or args[0] != project_id or args[1] != request.user.id:
+			return Response(
+				{'detail': 'Invitation batch not found'},
+				status=status.HTTP_404_NOT_FOUND
+			)
 		
-		# Update current step to 4 (Communicate) after successful invitation sending
-		if results['success'] > 0:
-			planning.current_step = 4
-			planning.save()
-			logger.info(f"Updated contracting planning to step 4 (Communicate)")
+		if task is None:
+			return Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
 		
-		return Response(results, status=status.HTTP_200_OK)
-	
-	def _html_to_plain_text(self, html: str) -> str:
-		"""
-		Convert HTML to plain text (simple implementation).
+		if not task.success:
+			logger.error("Invitation task %s failed: %s", task_id, task.result)
+			return Response(
+				{'detail': 'Failed to send invitations'},
+				status=status.HTTP_500_INTERNAL_SERVER_ERROR
+			)
 		
-		Args:
-			html: HTML string
-			
-		Returns:
-			Plain text string
-		"""
-		import re
-		# Remove HTML tags
-		text = re.sub(r'<[^>]+>', '', html)
-		# Decode HTML entities
-		import html as html_module
-		text = html_module.unescape(text)
-		# Clean up whitespace
-		text = re.sub(r'\s+', ' ', text).strip()
-		return text
+		return Response(task.result, status=status.HTTP_200_OK)
@@ -54,7 +54,7 @@ class UpdateStepView(APIView):
 			planning.current_step = new_step
 			planning.save()
 			
-			logger.info(f"Updated contracting step to {new_step} for project {project_id}")
+			logger.info("Updated contracting step to %s for project %s", new_step, project_id)
 			
 			return Response({
 				'current_step': planning.current_step,
@@ -62,7 +62,7 @@ class UpdateStepView(APIView):
 			})
 			
 		except Exception as e:
-			logger.error(f"Error updating step: {str(e)}", exc_info=True)
+			logger.error("Error updating step: %s", e, exc_info=True)
 			return Response(
 				{'detail': f'Error updating step: {str(e)}'},
 				status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3,15 +3,15 @@ from .contracting_planning_create_view import ContractingPlanningCreateView
 from .contracting_planning_detail_view import ContractingPlanningDetailView
 from .contracting_planning_answer_view import ContractingPlanningAnswerView
 from .contracting_planning_invitation_view import ContractingPlanningInvitationView
-from .contracting_planning_pdf_view import ContractingPlanningPDFView
+from .contracting_planning_pdf_view import ContractingPlanningPDFView, ContractingPlanningPDFResultView
 from .contracting_planning_modify_email_view import ContractingPlanningModifyEmailView
-from .send_invitations_view import SendInvitationsView
+from .send_invitations_view import SendInvitationsView, SendInvitationsResultView
 from .contractor_list_view import ContractorListView
 from .conversation_list_view import ConversationListView
 from .conversation_messages_view import ConversationMessagesView
 from .mark_messages_read_view import MarkMessagesReadView
 from .update_step_view import UpdateStepView
-from .action_views import ApproveActionView, RejectActionView, ModifyActionView
+from .action_views import ApproveActionView, RejectActionView, ModifyActionView, BulkActionView
 from .offer_views import (
 	OfferListView,
 	OfferDetailView,
@@ -34,7 +34,9 @@ urlpatterns = [
 	path('planning/<int:project_id>/invitation/', ContractingPlanningInvitationView.as_view(), name='contracting-planning-invitation'),
 	path('planning/<int:project_id>/invitation/modify/', ContractingPlanningModifyEmailView.as_view(), name='contracting-planning-modify-email'),
 	path('planning/<int:project_id>/invitation/send/', SendInvitationsView.as_view(), name='contracting-planning-send-invitations'),
+	path('planning/<int:project_id>/invitation/send/<str:task_id>/', SendInvitationsResultView.as_view(), name='contracting-planning-send-invitations-result'),
 	path('planning/<int:project_id>/pdf/', ContractingPlanningPDFView.as_view(), name='contracting-planning-pdf'),
+	path('planning/<int:project_id>/pdf/<str:task_id>/', ContractingPlanningPDFResultView.as_view(), name='contracting-planning-pdf-result'),
 	# Import planning data (Planning -> Contracting)
 	path('planning/<int:project_id>/import-from-planning/', ImportFromPlanningView.as_view(), name='contracting-planning-import'),
 	
@@ -50,6 +52,7 @@ urlpatterns = [
 	path('planning/<int:project_id>/conversations/<int:contractor_id>/actions/<int:action_id>/approve/', ApproveActionView.as_view(), name='action-approve'),
 	path('planning/<int:project_id>/conversations/<int:contractor_id>/actions/<int:action_id>/reject/', RejectActionView.as_view(), name='action-reject'),
 	path('planning/<int:project_id>/conversations/<int:contractor_id>/actions/<int:action_id>/modify/', ModifyActionView.as_view(), name='action-modify'),
+	path('planning/<int:project_id>/conversations/<int:contractor_id>/actions/bulk/', BulkActionView.as_view(), name='action-bulk'),
 	
 	# Offer endpoints
 	path('planning/<int:project_id>/offers/', OfferListView.as_view(), name='offer-list'),
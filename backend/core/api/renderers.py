@@ -0,0 +1,27 @@
+"""
+orjson-backed JSON renderer for the REST API
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+	"""
+	Drop-in JSONRenderer that encodes with orjson.
+
+	Types orjson does not know (Decimal, lazy translations, querysets, ...)
+	go through DRF's own encoder. Indented output, as requested by the
+	browsable API or ?indent=, is left to the stock renderer.
+	"""
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		if data is None:
+			return b""
+		if self.get_indent(accepted_media_type, renderer_context or {}):
+			return super().render(data, accepted_media_type, renderer_context)
+		return orjson.dumps(data, default=_fallback_encoder.default, option=ORJSON_OPTIONS)
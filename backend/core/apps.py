@@ -5,4 +5,7 @@ class CoreConfig(AppConfig):
 	default_auto_field = "django.db.models.BigAutoField"
 	name = "core"
 
-
+	def ready(self):
+		from . import signals  # noqa: F401
+		from .log_queue import start_listener
+		start_listener()
@@ -0,0 +1,64 @@
+"""
+Queue-based logging: request threads only enqueue records, a listener thread formats and writes them
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_queue = queue.Queue(-1)
+_listener = None
+_listener_pid = None
+_lock = threading.Lock()
+
+
+def start_listener():
+	"""Start the listener thread for this process (idempotent; restarts after a fork)."""
+	global _listener, _listener_pid
+	with _lock:
+		if _listener_pid == os.getpid():
+			return
+		handler = logging.StreamHandler()
+		handler.setFormatter(logging.Formatter(LOG_FORMAT))
+		_listener = QueueListener(_queue, handler, respect_handler_level=True)
+		_listener.start()
+		_listener_pid = os.getpid()
+
+
+def stop_listener():
+	"""Flush queued records on interpreter exit."""
+	if _listener is not None and _listener_pid == os.getpid():
+		_listener.stop()
+
+
+atexit.register(stop_listener)
+
+
+class DeferredQueueHandler(QueueHandler):
+	"""
+	QueueHandler that leaves formatting to the listener.
+
+	The stock prepare() formats the record, tracebacks included, in the
+	calling thread; here only the message arguments are merged so exc_info
+	is rendered by the listener. Django-Q forks its workers after setup,
+	so the listener is (re)started lazily in whichever process emits.
+	"""
+
+	def __init__(self):
+		super().__init__(_queue)
+
+	def prepare(self, record):
+		record = copy.copy(record)
+		record.msg = record.getMessage()
+		record.args = None
+		return record
+
+	def emit(self, record):
+		if _listener_pid != os.getpid():
+			start_listener()
+		super().emit(record)
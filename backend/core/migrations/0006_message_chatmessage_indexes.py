@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_merge_0002_add_renovation_plan_0004_usermemory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['created_at'], name='core_chatme_created_2cbae1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['-timestamp'], name='core_messag_timesta_026e18_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_message_chatmessage_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractingplanning',
+            name='ai_status',
+            field=models.CharField(choices=[('idle', 'Idle'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='idle', help_text='State of the background job that fills ai_summary and ai_questions', max_length=20, verbose_name='AI Processing Status'),
+        ),
+    ]
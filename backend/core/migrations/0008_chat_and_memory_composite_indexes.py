@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-16 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_contractingplanning_ai_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', 'created_at'], name='core_chatme_session_76a3ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['user', 'is_active'], name='core_chatse_user_id_a2d218_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermemory',
+            index=models.Index(fields=['user', 'is_active'], name='core_userme_user_id_d4b64e_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-16 13:05
+
+from django.db import migrations, models
+
+
+def copy_selected_contractors(apps, schema_editor):
+    """Copy the selected_contractors id lists into the new relation."""
+    ContractingPlanning = apps.get_model('core', 'ContractingPlanning')
+    Contractor = apps.get_model('core', 'Contractor')
+    Through = ContractingPlanning.selected_contractors_m2m.through
+
+    existing_ids = set(Contractor.objects.values_list('id', flat=True))
+    rows = []
+    plannings = ContractingPlanning.objects.filter(selected_contractors__isnull=False).values_list('id', 'selected_contractors')
+    for planning_id, contractor_ids in plannings:
+        # Ids came straight from request bodies, so they may be strings or repeated
+        for contractor_id in {int(value) for value in contractor_ids or [] if str(value).isdigit()}:
+            if contractor_id in existing_ids:
+                rows.append(Through(contractingplanning_id=planning_id, contractor_id=contractor_id))
+    Through.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_chat_and_memory_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractingplanning',
+            name='selected_contractors_m2m',
+            field=models.ManyToManyField(blank=True, help_text='Contractors selected for invitation; replaces the selected_contractors list', related_name='plannings', to='core.contractor', verbose_name='Selected Contractors (relation)'),
+        ),
+        migrations.RunPython(copy_selected_contractors, migrations.RunPython.noop),
+    ]
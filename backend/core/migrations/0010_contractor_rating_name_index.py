@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-16 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_contractingplanning_selected_contractors_m2m'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contractor',
+            index=models.Index(fields=['-rating', 'name'], name='core_contra_rating_9a90ed_idx'),
+        ),
+    ]
@@ -34,6 +34,10 @@ class ChatMessage(models.Model):
         ordering = ['created_at']
         verbose_name = "Chat Message"
         verbose_name_plural = "Chat Messages"
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['session', 'created_at']),
+        ]
 
     def __str__(self):
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
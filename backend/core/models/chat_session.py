@@ -50,6 +50,9 @@ class ChatSession(models.Model):
         ordering = ['-updated_at']
         verbose_name = "Chat Session"
         verbose_name_plural = "Chat Sessions"
+        indexes = [
+            models.Index(fields=['user', 'is_active']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title} ({self.created_at.strftime('%Y-%m-%d')})"
\ No newline at end of file
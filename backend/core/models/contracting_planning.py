@@ -1,11 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from .project import Project
 
+# Django-Q kills a task after the cluster timeout, so a planning still
+# 'processing' past it lost its worker and will never finish
+AI_PROCESSING_TIMEOUT = timedelta(seconds=settings.Q_CLUSTER['timeout'])
+
 
 class ContractingPlanning(models.Model):
 	"""
 	Store custom contracting requirements and uploaded documents
 	"""
+	AI_STATUS_CHOICES = [
+		('idle', 'Idle'),
+		('processing', 'Processing'),
+		('completed', 'Completed'),
+		('failed', 'Failed'),
+	]
+	
 	project = models.OneToOneField(
 		Project,
 		on_delete=models.CASCADE,
@@ -35,12 +50,26 @@ class ContractingPlanning(models.Model):
 		null=True,
 		help_text="User's answers to AI-generated questions"
 	)
+	ai_status = models.CharField(
+		"AI Processing Status",
+		max_length=20,
+		choices=AI_STATUS_CHOICES,
+		default='idle',
+		help_text="State of the background job that fills ai_summary and ai_questions"
+	)
 	selected_contractors = models.JSONField(
 		"Selected Contractors",
 		blank=True,
 		null=True,
 		help_text="Array of contractor IDs selected for invitation"
 	)
+	selected_contractors_m2m = models.ManyToManyField(
+		'Contractor',
+		blank=True,
+		related_name='plannings',
+		verbose_name="Selected Contractors (relation)",
+		help_text="Contractors selected for invitation; replaces the selected_contractors list"
+	)
 	current_step = models.IntegerField(
 		"Current Step",
 		default=1,
@@ -57,6 +86,10 @@ class ContractingPlanning(models.Model):
 	def __str__(self):
 		return f"Planning for {self.project.name}"
 
+	def is_ai_processing_stale(self):
+		"""Whether ai_status has been 'processing' for longer than a task may run"""
+		return self.ai_status == 'processing' and self.updated_at < timezone.now() - AI_PROCESSING_TIMEOUT
+
 
 class ContractingPlanningFile(models.Model):
 	"""
@@ -218,6 +251,7 @@ class Message(models.Model):
 		ordering = ['timestamp']
 		indexes = [
 			models.Index(fields=['contracting_planning', 'contractor_id', 'timestamp']),
+			models.Index(fields=['-timestamp']),
 		]
 	
 	def __str__(self):
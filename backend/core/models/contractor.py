@@ -51,6 +51,10 @@ class Contractor(models.Model):
 
 	class Meta:
 		ordering = ["-rating", "name"]
+		indexes = [
+			# Matches the default ordering so list pages are read in index order
+			models.Index(fields=["-rating", "name"]),
+		]
 		verbose_name = "Contractor"
 		verbose_name_plural = "Contractors"
 
@@ -59,6 +59,9 @@ class UserMemory(models.Model):
         verbose_name = "User Memory"
         verbose_name_plural = "User Memories"
         unique_together = ['user', 'key']
+        indexes = [
+            models.Index(fields=['user', 'is_active']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.key}: {self.value[:30]}"
\ No newline at end of file
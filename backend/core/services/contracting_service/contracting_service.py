@@ -9,6 +9,7 @@ import logging
 import mimetypes
 import os
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -760,11 +761,14 @@ The attachments are included in this conversation. Analyze them carefully to und
 
 # Singleton instance (lazy initialization)
 _contracting_service: Optional[ContractingService] = None
+_contracting_service_lock = threading.Lock()
 
 def get_contracting_service() -> ContractingService:
     """Get or create the singleton contracting service instance."""
     global _contracting_service
     if _contracting_service is None:
-        _contracting_service = ContractingService()
+        # Threaded workers may race on first use; build the client only once
+        with _contracting_service_lock:
+            if _contracting_service is None:
+                _contracting_service = ContractingService()
     return _contracting_service
-
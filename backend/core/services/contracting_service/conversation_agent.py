@@ -546,7 +546,6 @@ class ConversationAgent:
                 for attachment in attachments:
                     try:
                         # Upload file to Gemini
-                        file_content = attachment.read()
                         mime_type = attachment.content_type or 'application/octet-stream'
                         
                         # Upload file to Gemini API
@@ -560,7 +559,8 @@ class ConversationAgent:
                         # Create a temporary file
                         import tempfile
                         with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{attachment.name}") as tmp_file:
-                            tmp_file.write(file_content)
+                            for chunk in attachment.chunks():
+                                tmp_file.write(chunk)
                             tmp_path = tmp_file.name
                         
                         # Upload the temporary file
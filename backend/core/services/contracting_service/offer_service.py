@@ -287,7 +287,8 @@ Email Body:
         self,
         offer: ContractorOffer,
         planning: ContractingPlanning,
-        conversation_history: Optional[str] = None
+        conversation_history: Optional[str] = None,
+        contractor_name: Optional[str] = None
     ) -> OfferAnalysis:
         """
         Analyze a single offer with project context and conversation history.
@@ -302,7 +303,8 @@ Email Body:
             offer: ContractorOffer instance to analyze
             planning: ContractingPlanning instance
             conversation_history: Optional conversation history for re-analysis context
-            
+            contractor_name: Optional contractor name already loaded by the caller
+
         Returns:
             OfferAnalysis instance with analysis report
         """
@@ -322,7 +324,8 @@ Email Body:
                 analysis_prompt_template,
                 offer,
                 planning,
-                context
+                context,
+                contractor_name
             )
             
             # Generate analysis using Gemini
@@ -578,15 +581,17 @@ Email Body:
         template: str,
         offer: ContractorOffer,
         planning: ContractingPlanning,
-        context: Dict
+        context: Dict,
+        contractor_name: Optional[str] = None
     ) -> str:
         """Build the complete prompt for offer analysis."""
-        # Get contractor info
-        try:
-            contractor = Contractor.objects.get(id=offer.contractor_id)
-            contractor_name = contractor.name
-        except:
-            contractor_name = f"Contractor {offer.contractor_id}"
+        # Get contractor info unless the caller already has it
+        if contractor_name is None:
+            try:
+                contractor = Contractor.objects.get(id=offer.contractor_id)
+                contractor_name = contractor.name
+            except:
+                contractor_name = f"Contractor {offer.contractor_id}"
         
         # Format offer data
         offer_summary = f"""
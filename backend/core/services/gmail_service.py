@@ -1,22 +1,33 @@
 """
 Gmail Service - Handles Gmail OAuth and email sending via Gmail API
 """
+import io
 import os
 from datetime import datetime, timedelta, timezone as dt_timezone
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from django.conf import settings
 from django.utils import timezone
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.http import MediaIoBaseUpload
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
+from email.header import Header
 from email import encoders
 import base64
 import mimetypes
 
+# Gmail accepts up to 100 calls per batch but starts rate limiting above 50
+GMAIL_BATCH_SIZE = 50
+
+# Prebuilt messages above this size skip the batch and go through a resumable
+# upload of the raw RFC 822 bytes, sent in chunks of GMAIL_UPLOAD_CHUNK_SIZE
+GMAIL_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+GMAIL_UPLOAD_CHUNK_SIZE = 256 * 1024
+
 
 class GmailService:
 	"""Service for handling Gmail OAuth and email operations."""
@@ -162,28 +173,12 @@ class GmailService:
 		return profile['emailAddress']
 
 	@staticmethod
-	def create_message(
-		sender: str,
-		to: str,
-		subject: str,
+	def _build_mime_body(
 		body: str,
 		html_body: Optional[str] = None,
 		attachments: Optional[List[Dict]] = None
-	) -> Dict:
-		"""
-		Create a message for an email.
-		
-		Args:
-			sender: Email address of the sender
-			to: Email address of the receiver
-			subject: Subject of the email
-			body: Plain text body of the email
-			html_body: Optional HTML body of the email
-			attachments: Optional list of attachment dicts with 'filename' and 'content' (bytes)
-			
-		Returns:
-			Message object as a dictionary
-		"""
+	):
+		"""MIME body (text, optional HTML, attachments) without address or subject headers."""
 		# If we have attachments, use multipart/mixed
 		if attachments:
 			message = MIMEMultipart('mixed')
@@ -230,6 +225,51 @@ class GmailService:
 			else:
 				message = MIMEText(body)
 		
+		return message
+
+	@staticmethod
+	def prebuild_mime(
+		subject: str,
+		body: str,
+		html_body: Optional[str] = None,
+		attachments: Optional[List[Dict]] = None
+	) -> Tuple[str, bytes]:
+		"""
+		Serialize a message body once for many recipients.
+		
+		Attachments are base64-encoded here, a single time; send_batch only
+		prepends the per-recipient headers. Returns (headers_template, body_bytes)
+		where headers_template has {to} and {sender} placeholders.
+		"""
+		message = GmailService._build_mime_body(body, html_body, attachments)
+		headers_template = 'to: {to}\nfrom: {sender}\nsubject: ' + Header(subject, 'utf-8').encode() + '\n'
+		return headers_template, message.as_bytes()
+
+	@staticmethod
+	def create_message(
+		sender: str,
+		to: str,
+		subject: str,
+		body: str,
+		html_body: Optional[str] = None,
+		attachments: Optional[List[Dict]] = None
+	) -> Dict:
+		"""
+		Create a message for an email.
+		
+		Args:
+			sender: Email address of the sender
+			to: Email address of the receiver
+			subject: Subject of the email
+			body: Plain text body of the email
+			html_body: Optional HTML body of the email
+			attachments: Optional list of attachment dicts with 'filename' and 'content' (bytes)
+			
+		Returns:
+			Message object as a dictionary
+		"""
+		message = GmailService._build_mime_body(body, html_body, attachments)
+		
 		message['to'] = to
 		message['from'] = sender
 		message['subject'] = subject
@@ -291,6 +331,100 @@ class GmailService:
 			'raw_response': result
 		}
 
+	@staticmethod
+	def send_batch(
+		access_token: str,
+		messages: List[Dict],
+		sender: Optional[str] = None
+	) -> List[Dict]:
+		"""
+		Send several emails through Gmail's batch endpoint, one HTTP round trip
+		per GMAIL_BATCH_SIZE messages instead of one per message. Prebuilt
+		messages over GMAIL_UPLOAD_THRESHOLD are uploaded individually instead.
+		
+		Args:
+			access_token: Valid access token
+			messages: List of dicts with send_email's to, subject, body and
+				optional html_body, attachments and thread_id; 'to' plus a
+				prebuild_mime() result under 'prebuilt' replaces the content keys
+			sender: Optional sender email (defaults to 'me')
+			
+		Returns:
+			One dict per message, in order: send_email's result, or {'error': str}
+			when that message failed
+		"""
+		credentials = Credentials(token=access_token)
+		service = build('gmail', 'v1', credentials=credentials)
+		
+		if not sender:
+			profile = service.users().getProfile(userId='me').execute()
+			sender = profile['emailAddress']
+		
+		results = [None] * len(messages)
+		
+		def store_result(request_id, response, exception):
+			if exception is not None:
+				results[int(request_id)] = {'error': str(exception)}
+			else:
+				results[int(request_id)] = {
+					'message_id': response.get('id'),
+					'thread_id': response.get('threadId'),
+					'label_ids': response.get('labelIds', []),
+					'raw_response': response
+				}
+		
+		# Batch bodies are held in memory whole and cannot carry media uploads,
+		# so large prebuilt messages are streamed one by one instead
+		batched = []
+		for index, item in enumerate(messages):
+			if 'prebuilt' in item and len(item['prebuilt'][1]) > GMAIL_UPLOAD_THRESHOLD:
+				headers_template, body_bytes = item['prebuilt']
+				headers = headers_template.format(to=item['to'], sender=sender).encode()
+				try:
+					response = service.users().messages().send(
+						userId='me',
+						body={'threadId': item['thread_id']} if item.get('thread_id') else {},
+						media_body=MediaIoBaseUpload(
+							io.BytesIO(headers + body_bytes),
+							mimetype='message/rfc822',
+							chunksize=GMAIL_UPLOAD_CHUNK_SIZE,
+							resumable=True
+						)
+					).execute()
+				except Exception as e:
+					store_result(str(index), None, e)
+				else:
+					store_result(str(index), response, None)
+			else:
+				batched.append(index)
+		
+		for start in range(0, len(batched), GMAIL_BATCH_SIZE):
+			batch = service.new_batch_http_request(callback=store_result)
+			for index in batched[start:start + GMAIL_BATCH_SIZE]:
+				item = messages[index]
+				if 'prebuilt' in item:
+					headers_template, body_bytes = item['prebuilt']
+					headers = headers_template.format(to=item['to'], sender=sender).encode()
+					message = {'raw': base64.urlsafe_b64encode(headers + body_bytes).decode()}
+				else:
+					message = GmailService.create_message(
+						sender,
+						item['to'],
+						item['subject'],
+						item['body'],
+						item.get('html_body'),
+						item.get('attachments')
+					)
+				if item.get('thread_id'):
+					message['threadId'] = item['thread_id']
+				batch.add(
+					service.users().messages().send(userId='me', body=message),
+					request_id=str(index)
+				)
+			batch.execute()
+		
+		return results
+
 	@staticmethod
 	def send_bulk_emails(
 		access_token: str,
@@ -0,0 +1,48 @@
+"""
+Hedged calls for high-variance upstream requests (Gemini generation).
+
+When GEMINI_HEDGED_REQUESTS is enabled, a call that has not returned within
+GEMINI_HEDGE_DELAY_SECONDS gets a second identical call, and whichever finishes
+first wins. The delay is the cost budget: only the slow tail pays for a second
+LLM request.
+"""
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared so a losing call can finish in the background without blocking the caller
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gemini-hedge")
+
+
+def hedged_call(fn, *args, **kwargs):
+    """
+    Call fn(*args, **kwargs), hedging it with a duplicate call if it is slow.
+
+    Returns the result of the first call to complete without raising; if every
+    call raises, the last exception is re-raised.
+    """
+    if not getattr(settings, "GEMINI_HEDGED_REQUESTS", False):
+        return fn(*args, **kwargs)
+
+    delay = getattr(settings, "GEMINI_HEDGE_DELAY_SECONDS", 0)
+    pending = {_executor.submit(fn, *args, **kwargs)}
+
+    done, pending = wait(pending, timeout=delay)
+    if not done:
+        logger.info("Hedging %s after %ss", getattr(fn, '__name__', fn), delay)
+        pending.add(_executor.submit(fn, *args, **kwargs))
+
+    error = None
+    while done or pending:
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    raise error
@@ -0,0 +1,15 @@
+"""
+Model signal handlers for the core app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import ChatMessage, ChatSession
+
+
+@receiver(post_save, sender=ChatMessage)
+@receiver(post_delete, sender=ChatMessage)
+def touch_chat_session(sender, instance, **kwargs):
+	"""Bump the parent session's updated_at so cached session payloads are invalidated."""
+	ChatSession.objects.filter(pk=instance.session_id).update(updated_at=timezone.now())
@@ -53,7 +53,7 @@ def poll_contractor_emails():
     
     except Exception as e:
         duration = (timezone.now() - start_time).total_seconds()
-        logger.error(f"Email monitoring task failed after {duration:.2f}s: {str(e)}", exc_info=True)
+        logger.error("Email monitoring task failed after %.2fs: %s", duration, e, exc_info=True)
         
         return {
             'success': False,
@@ -0,0 +1,145 @@
+"""
+PDF Rendering Task - Renders invitation/plan HTML to PDF with WeasyPrint outside the request cycle
+"""
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Rendered files only need to live until the client has downloaded them.
+# They are named after a hash of the HTML, so re-exporting identical content
+# within that window reuses the file instead of rendering it again
+GENERATED_PDF_DIR = 'generated_pdfs'
+GENERATED_PDF_MAX_AGE = timedelta(hours=1)
+
+# Default styling for better PDF rendering
+DEFAULT_PDF_CSS = '''
+    @page {
+        size: A4;
+        margin: 2cm;
+    }
+    body {
+        font-family: Arial, sans-serif;
+        font-size: 11pt;
+        line-height: 1.5;
+        color: #000;
+    }
+    h1 {
+        font-size: 20pt;
+        margin-top: 0;
+        margin-bottom: 0.5em;
+    }
+    h2 {
+        font-size: 16pt;
+        margin-top: 1em;
+        margin-bottom: 0.5em;
+    }
+    h3 {
+        font-size: 14pt;
+        margin-top: 0.8em;
+        margin-bottom: 0.4em;
+    }
+    p {
+        margin-bottom: 0.5em;
+    }
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin-bottom: 1em;
+    }
+    th, td {
+        border: 1px solid #ddd;
+        padding: 8px;
+        text-align: left;
+    }
+    th {
+        background-color: #f2f2f2;
+        font-weight: bold;
+    }
+'''
+
+# Parsed once per worker. WeasyPrint (and its native libs) is optional, so
+# rendering reports it as unavailable when the import fails
+try:
+    from weasyprint import HTML, CSS
+    _DEFAULT_CSS = CSS(string=DEFAULT_PDF_CSS)
+except (ImportError, OSError):
+    HTML = CSS = None
+    _DEFAULT_CSS = None
+
+
+def render_pdf_bytes(html_content):
+    """
+    Return html_content rendered to PDF bytes, or None when WeasyPrint is not installed.
+    """
+    if _DEFAULT_CSS is None:
+        return None
+
+    logger.info("Generating PDF from HTML content (length: %s)", len(html_content))
+    return HTML(string=html_content).write_pdf(stylesheets=[_DEFAULT_CSS])
+
+
+def cleanup_generated_pdfs(project_id=None, max_age=GENERATED_PDF_MAX_AGE):
+    """
+    Delete rendered PDFs older than max_age, for one project or all of them.
+
+    Returns the number of files deleted.
+    """
+    if project_id is not None:
+        directories = [f"{GENERATED_PDF_DIR}/{project_id}"]
+    elif default_storage.exists(GENERATED_PDF_DIR):
+        directories = [f"{GENERATED_PDF_DIR}/{name}" for name in default_storage.listdir(GENERATED_PDF_DIR)[0]]
+    else:
+        directories = []
+
+    cutoff = timezone.now() - max_age
+    deleted = 0
+    for directory in directories:
+        if not default_storage.exists(directory):
+            continue
+        for name in default_storage.listdir(directory)[1]:
+            path = f"{directory}/{name}"
+            if default_storage.get_modified_time(path) < cutoff:
+                default_storage.delete(path)
+                deleted += 1
+    return deleted
+
+
+def render_pdf_task(project_id, html_content, filename, user_id):
+    """
+    Render html_content to PDF and store it under MEDIA_ROOT/generated_pdfs/.
+    Files are removed after GENERATED_PDF_MAX_AGE by cleanup_generated_pdfs.
+
+    Enqueued by ContractingPlanningPDFView; the returned dictionary is read by
+    ContractingPlanningPDFResultView to serve the file.
+    """
+    # Files already downloaded (or abandoned) by earlier exports are pruned here
+    cleanup_generated_pdfs(project_id)
+
+    digest = hashlib.blake2b(html_content.encode(), digest_size=16).hexdigest()
+    path = f"{GENERATED_PDF_DIR}/{project_id}/{digest}.pdf"
+
+    if default_storage.exists(path):
+        logger.info("Reusing rendered PDF for identical HTML content: %s", path)
+    else:
+        pdf_bytes = render_pdf_bytes(html_content)
+        if pdf_bytes is None:
+            logger.error("WeasyPrint not installed")
+            return {
+                'success': False,
+                'error': 'PDF generation service not available. WeasyPrint is not installed.'
+            }
+        path = default_storage.save(path, ContentFile(pdf_bytes))
+        logger.info("Successfully generated PDF: %s", filename)
+
+    return {
+        'success': True,
+        'path': path,
+        'filename': filename,
+        'user_id': user_id
+    }
@@ -0,0 +1,109 @@
+"""
+Plan Generation Task - Runs chat extraction and renovation plan generation off the request thread
+"""
+import logging
+from functools import lru_cache
+
+from django.contrib.auth import get_user_model
+
+from core.api.chatbot.services import ChatbotService
+from core.models import ChatSession, RenovationPlan
+from core.services.request_hedging import hedged_call
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _chatbot_service():
+    return ChatbotService()
+
+
+@lru_cache(maxsize=1)
+def _plan_service():
+    # Import here to avoid circular imports
+    from core.api.planning_work.services import GeminiService
+    return GeminiService()
+
+
+def generate_plan_from_chat(session_id, user_id):
+    """
+    Extract renovation data from a chat session and generate a plan from it.
+
+    Enqueued by ExtractAndGeneratePlanView via Django-Q; the returned dictionary
+    is stored as the task result and served by the plan status endpoint.
+    """
+    user = get_user_model().objects.get(id=user_id)
+    # Loaded once here; extraction and the plan bookkeeping below share it
+    session = ChatSession.objects.filter(id=session_id, user=user).first()
+
+    extraction_result = _chatbot_service().extract_plan_data(
+        session_id=session_id,
+        user=user,
+        session=session
+    )
+
+    if not extraction_result["success"]:
+        return {
+            "success": False,
+            "error": extraction_result["error"],
+            "step": "extraction"
+        }
+
+    extracted_data = extraction_result["data"]
+
+    plan_input = {
+        "building_type": extracted_data.get("building_type") or "Unknown",
+        "budget": float(extracted_data.get("budget") or 0),
+        "location": extracted_data.get("location") or "Germany",
+        "building_size": int(extracted_data.get("building_size") or 0),
+        "goals": extracted_data.get("renovation_goals") or [],
+        "building_age": extracted_data.get("building_age") or "Unknown",
+        "current_condition": extracted_data.get("current_condition") or "",
+        "specific_materials": extracted_data.get("specific_materials") or [],
+        "rooms_involved": extracted_data.get("rooms_involved") or [],
+        "timeline": extracted_data.get("timeline") or "",
+        "special_requirements": extracted_data.get("special_requirements") or [],
+    }
+
+    try:
+        plan_result = hedged_call(
+            _plan_service().generate_renovation_plan,
+            building_type=plan_input["building_type"],
+            budget=plan_input["budget"],
+            location=plan_input["location"],
+            building_size=plan_input["building_size"],
+            renovation_goals=plan_input["goals"],
+            dynamic_context=plan_input
+        )
+
+        # Mark session as plan generated
+        if session:
+            session.is_plan_generated = True
+            session.save(update_fields=['is_plan_generated', 'updated_at'])
+
+        # Save the plan to database
+        if plan_result.get('success') and plan_result.get('plan'):
+            renovation_plan = RenovationPlan.objects.create(
+                user=user,
+                plan_name=f"Plan from Chat - {session.title}" if session else "Chat Generated Plan",
+                plan_data=plan_result.get('plan', {}),
+                input_data=plan_input,
+                status='generated'
+            )
+            plan_result['plan_id'] = renovation_plan.id
+
+        return {
+            "success": True,
+            "extracted_data": extracted_data,
+            "plan": plan_result,
+            "session_id": session_id
+        }
+
+    except Exception as e:
+        logger.exception("Error during plan generation: %s", e)
+        return {
+            "success": False,
+            "error": f"Plan generation failed: {str(e)}",
+            "step": "generation",
+            "extracted_data": extracted_data
+        }
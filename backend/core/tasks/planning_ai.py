@@ -0,0 +1,52 @@
+"""
+Planning AI Task - Generates the contracting planning summary and questions in the background
+"""
+import logging
+
+from core.models import ContractingPlanning
+from core.services.contracting_service.contracting_service import get_contracting_service
+
+logger = logging.getLogger(__name__)
+
+
+def process_planning_with_ai_task(planning_id):
+	"""
+	Run Gemini over a planning's description and uploaded files and store the results.
+
+	Enqueued by ContractingPlanningCreateView, ImportFromPlanningView and
+	ContractingPlanningDetailView (?regenerate_ai=true). ai_status moves from
+	'processing' to 'completed' or 'failed'; clients poll ContractingPlanningDetailView for it.
+	"""
+	planning = ContractingPlanning.objects.filter(id=planning_id).first()
+	if planning is None:
+		logger.warning("Planning %s no longer exists, skipping AI processing", planning_id)
+		return {'success': False, 'error': 'Planning not found'}
+
+	# Time the run from when a worker picks it up, not from when it was queued
+	planning.ai_status = 'processing'
+	planning.save(update_fields=['ai_status', 'updated_at'])
+
+	try:
+		logger.info("Processing planning %s with Gemini AI", planning.id)
+		ai_results = get_contracting_service().process_planning_with_ai(planning=planning)
+	except Exception as e:
+		logger.error("AI processing failed for planning %s: %s", planning.id, e, exc_info=True)
+		planning.ai_status = 'failed'
+		planning.save(update_fields=['ai_status', 'updated_at'])
+		return {'success': False, 'error': str(e)}
+
+	if ai_results.get('success'):
+		# Keep what the caller stored (e.g. an imported plan summary) when the
+		# service has nothing better
+		if ai_results.get('summary'):
+			planning.ai_summary = ai_results['summary']
+		if ai_results.get('questions') is not None:
+			planning.ai_questions = ai_results['questions']
+		planning.ai_status = 'completed'
+		planning.save(update_fields=['ai_summary', 'ai_questions', 'ai_status', 'updated_at'])
+		logger.info("AI insights saved to database for planning %s", planning.id)
+	else:
+		planning.ai_status = 'failed'
+		planning.save(update_fields=['ai_status', 'updated_at'])
+
+	return {'success': planning.ai_status == 'completed', 'planning_id': planning.id}
@@ -0,0 +1,19 @@
+"""
+Lookups on the Django-Q broker queue for task status views
+"""
+from django_q.models import OrmQ
+
+
+def queued_task(task_id):
+    """
+    The package of a task that is still in the broker queue, or None.
+
+    Queue entries stay in place while a worker runs them and are removed once
+    the result is saved, so a task that fetch() does not know about and that
+    is not queued either was never enqueued or its result has been pruned.
+    """
+    for entry in OrmQ.objects.all():
+        package = entry.task()
+        if package['id'] == task_id:
+            return package
+    return None
@@ -0,0 +1,267 @@
+"""
+Send Invitations Task - Sends contractor invitation emails via Gmail outside the request cycle
+"""
+import html as html_module
+import logging
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import ContractingPlanning, Contractor, EmailCredential, Message, SentEmail
+from core.services.gmail_service import GmailService
+from core.tasks.pdf_rendering import render_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+
+WELCOME_MESSAGE = (
+	"Hello! I'm your AI agent helping you communicate with {contractor_name}. "
+	"I'll facilitate your conversation and help clarify any questions you have about "
+	"your renovation project. Feel free to ask me anything!"
+)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_plain_text(html):
+	"""Strip tags, decode entities and collapse whitespace."""
+	text = _TAG_RE.sub('', html)
+	text = html_module.unescape(text)
+	return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _read_into_buffer(f, size):
+	"""
+	Read f into one preallocated buffer and return a memoryview over it.
+
+	The MIME builder base64-encodes straight from the view, so the file
+	contents are held once instead of being copied into intermediate bytes.
+	"""
+	buffer = bytearray(size)
+	view = memoryview(buffer)
+	read = 0
+	while read < size:
+		count = f.readinto(view[read:])
+		if not count:
+			break
+		read += count
+	return view[:read]
+
+
+def _build_attachments(planning, renovation_plan_html, attachment_file_ids):
+	"""The renovation plan PDF (when WeasyPrint is available) plus the selected planning files."""
+	attachments = []
+
+	if renovation_plan_html:
+		try:
+			pdf_bytes = render_pdf_bytes(renovation_plan_html)
+			if pdf_bytes is None:
+				logger.warning("WeasyPrint not installed, PDF will not be attached")
+			else:
+				attachments.append({
+					'filename': f"Renovation_Plan_{planning.project.name.replace(' ', '_')}.pdf",
+					'content': pdf_bytes,
+					'content_type': 'application/pdf'
+				})
+		except Exception as e:
+			logger.error("Error generating PDF: %s", e, exc_info=True)
+
+	if attachment_file_ids:
+		for file_obj in planning.files.filter(id__in=attachment_file_ids):
+			try:
+				with file_obj.file.open('rb') as f:
+					attachments.append({
+						'filename': file_obj.filename,
+						'content': _read_into_buffer(f, file_obj.file.size),
+					})
+				logger.info("Added attachment: %s", file_obj.filename)
+			except Exception as e:
+				logger.error("Failed to read file %s: %s", file_obj.filename, e)
+
+	return attachments
+
+
+def send_invitations_task(project_id, user_id, planning_id, sends, renovation_plan_html, attachment_file_ids):
+	"""
+	Send the invitation recorded in each pending SentEmail row.
+
+	Enqueued by SendInvitationsView with sends as [(sent_email_id, contractor_id), ...];
+	each row moves from 'pending' to 'sent' or 'failed'. The returned dictionary
+	is read by SendInvitationsResultView.
+	"""
+	try:
+		return _send_invitations(planning_id, user_id, sends, renovation_plan_html, attachment_file_ids)
+	except Exception:
+		# Leave no row 'pending' for the client to wait on
+		SentEmail.objects.filter(
+			id__in=[sent_email_id for sent_email_id, _ in sends],
+			status='pending'
+		).update(status='failed', error_message='Sending failed unexpectedly')
+		raise
+
+
+def _refresh_credential(credential):
+	"""
+	Refresh an expired Gmail token; the batch may have waited in the queue
+	since SendInvitationsView checked it. Returns an error message or None.
+	"""
+	if credential.is_valid():
+		return None
+	if not credential.refresh_token:
+		return 'Gmail authentication required'
+	try:
+		token_data = GmailService.refresh_access_token(credential.refresh_token)
+	except Exception as e:
+		logger.error("Failed to refresh Gmail token for user %s: %s", credential.user_id, e)
+		return 'Gmail authentication expired'
+	credential.access_token = token_data['access_token']
+	credential.token_expiry = token_data['token_expiry']
+	credential.save()
+	logger.info("Refreshed Gmail token for user %s", credential.user_id)
+	return None
+
+
+def _send_invitations(planning_id, user_id, sends, renovation_plan_html, attachment_file_ids):
+	results = {
+		'success': 0,
+		'failed': 0,
+		'errors': [],
+		'sent_emails': []
+	}
+
+	planning = ContractingPlanning.objects.select_related('project').filter(id=planning_id).first()
+	credential = EmailCredential.objects.filter(user_id=user_id).first()
+	sent_email_ids = [sent_email_id for sent_email_id, _ in sends]
+	sent_emails = SentEmail.objects.in_bulk(sent_email_ids)
+	contractors = Contractor.objects.only('id', 'name', 'email').in_bulk(
+		[contractor_id for _, contractor_id in sends]
+	)
+
+	if planning is None:
+		error = 'Contracting planning not found'
+	elif credential is None:
+		error = 'Gmail authentication required'
+	else:
+		error = _refresh_credential(credential)
+	if error:
+		SentEmail.objects.filter(id__in=sent_email_ids).update(status='failed', error_message=error)
+		return {**results, 'failed': len(sends), 'error': error}
+
+	attachments = _build_attachments(planning, renovation_plan_html, attachment_file_ids)
+
+	pairs = []
+	for sent_email_id, contractor_id in sends:
+		sent_email = sent_emails.get(sent_email_id)
+		contractor = contractors.get(contractor_id)
+		if sent_email is None or contractor is None:
+			# Removed while the task was queued
+			SentEmail.objects.filter(id=sent_email_id).update(status='failed', error_message='Contractor not found')
+			results['failed'] += 1
+			continue
+		pairs.append((sent_email, contractor))
+
+	outcomes = [
+		(sent_email, contractor, None, 'No email address available')
+		for sent_email, contractor in pairs
+		if not contractor.email
+	]
+	deliverable = [(sent_email, contractor) for sent_email, contractor in pairs if contractor.email]
+
+	# All emails go out through Gmail's batch endpoint; every database write
+	# happens below once the responses are in
+	if deliverable:
+		try:
+			# Every row of a batch carries the same subject and body, so the MIME
+			# payload (attachments included) is encoded once and reused per recipient
+			first = deliverable[0][0]
+			prebuilt = GmailService.prebuild_mime(
+				first.subject,
+				html_to_plain_text(first.body_html),
+				first.body_html,
+				attachments
+			)
+			batch_results = GmailService.send_batch(
+				access_token=credential.access_token,
+				messages=[
+					{'to': contractor.email, 'prebuilt': prebuilt}
+					for _, contractor in deliverable
+				]
+			)
+		except Exception as e:
+			logger.error("Failed to send invitation batch: %s", e, exc_info=True)
+			batch_results = [{'error': str(e)}] * len(deliverable)
+
+		for (sent_email, contractor), result in zip(deliverable, batch_results):
+			if not result or 'error' in result:
+				error = result['error'] if result else 'No response from Gmail'
+				logger.error("Failed to send email to %s: %s", contractor.email, error)
+				outcomes.append((sent_email, contractor, None, error))
+			else:
+				outcomes.append((sent_email, contractor, result, None))
+
+	for sent_email, contractor, result, error in outcomes:
+		if error:
+			sent_email.status = 'failed'
+			sent_email.error_message = error
+
+			results['failed'] += 1
+			results['errors'].append({
+				'contractor_id': contractor.id,
+				'contractor_name': contractor.name,
+				'error': error
+			})
+			continue
+
+		sent_email.status = 'sent'
+		sent_email.sent_at = timezone.now()
+		sent_email.gmail_message_id = result.get('message_id')
+		sent_email.gmail_thread_id = result.get('thread_id')
+
+		results['success'] += 1
+		results['sent_emails'].append({
+			'id': sent_email.id,
+			'contractor_id': contractor.id,
+			'contractor_name': contractor.name,
+			'contractor_email': contractor.email,
+			'message_id': result.get('message_id')
+		})
+
+		logger.info("Successfully sent email to %s (message_id: %s)", contractor.email, result.get('message_id'))
+
+	# Create initial welcome messages for successfully contacted contractors
+	greeted = set(Message.objects.filter(
+		contracting_planning=planning,
+		contractor_id__in=[info['contractor_id'] for info in results['sent_emails']],
+		sender='ai'
+	).values_list('contractor_id', flat=True))
+
+	# Every post-send write commits together
+	with transaction.atomic():
+		SentEmail.objects.bulk_update(
+			[sent_email for sent_email, _, _, _ in outcomes],
+			['status', 'error_message', 'sent_at', 'gmail_message_id', 'gmail_thread_id']
+		)
+		Message.objects.bulk_create([
+			Message(
+				contracting_planning=planning,
+				contractor_id=info['contractor_id'],
+				sender='ai',
+				content=WELCOME_MESSAGE.format(contractor_name=info['contractor_name']),
+			)
+			for info in results['sent_emails']
+			if info['contractor_id'] not in greeted
+		])
+
+		# Move on to step 4 (Communicate) once any invitation went out;
+		# updated_at is set explicitly because update() skips auto_now
+		if results['success'] > 0:
+			ContractingPlanning.objects.filter(pk=planning.pk).update(
+				current_step=4,
+				updated_at=timezone.now()
+			)
+
+	logger.info("Email sending complete: %s succeeded, %s failed", results['success'], results['failed'])
+
+	return results
@@ -1,4 +1,26 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.api.chatbot.services import extract_json_object
+from core.api.renderers import ORJSONRenderer
+from core.models import (
+	ChatMessage,
+	ChatSession,
+	ContractingPlanning,
+	Contractor,
+	EmailCredential,
+	Message,
+	Project,
+	SentEmail,
+)
+from core.tasks.send_invitations import send_invitations_task
 
 
 class CoreSmokeTest(TestCase):
@@ -6,3 +28,206 @@ class CoreSmokeTest(TestCase):
 		self.assertTrue(True)
 
 
+class ExtractJsonObjectTest(SimpleTestCase):
+	def test_plain_object(self):
+		self.assertEqual(extract_json_object('{"budget": 8000}'), {"budget": 8000})
+
+	def test_fenced_object_with_surrounding_text(self):
+		text = 'Here you go:\n```json\n{"location": "Bayern", "goals": ["tiles"]}\n```\nAnything else?'
+		self.assertEqual(extract_json_object(text), {"location": "Bayern", "goals": ["tiles"]})
+
+	def test_missing_object_raises(self):
+		with self.assertRaises(ValueError):
+			extract_json_object("Sorry, I could not find anything.")
+
+
+class ChatSessionTouchTest(TestCase):
+	def test_new_message_bumps_session_updated_at(self):
+		user = User.objects.create_user(username="chat-user", password="pw")
+		session = ChatSession.objects.create(user=user)
+		before = session.updated_at
+
+		ChatMessage.objects.create(session=session, role="user", content="Hello")
+
+		session.refresh_from_db()
+		self.assertGreater(session.updated_at, before)
+
+
+class ORJSONRendererTest(SimpleTestCase):
+	def test_renders_like_json_renderer(self):
+		body = ORJSONRenderer().render({"price": Decimal("12.50"), 3: ["a", None]})
+		self.assertEqual(body, b'{"price":12.5,"3":["a",null]}')
+
+	def test_none_renders_empty_body(self):
+		self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class SendInvitationsTaskTest(TestCase):
+	def setUp(self):
+		self.user = User.objects.create_user(username="inviter", password="pw")
+		self.project = Project.objects.create(
+			user=self.user, name="Kitchen", address="Main St 1", city="Berlin",
+			postal_code="10115", state="Berlin"
+		)
+		self.planning = ContractingPlanning.objects.create(project=self.project, current_step=3)
+		self.credential = EmailCredential.objects.create(
+			user=self.user, access_token="token", token_expiry=timezone.now() + timedelta(hours=1)
+		)
+		self.delivered = Contractor.objects.create(name="Delivered GmbH", email="ok@example.com")
+		self.rejected = Contractor.objects.create(name="Rejected GmbH", email="bounce@example.com")
+		self.no_email = Contractor.objects.create(name="No Email GmbH")
+		self.contractors = [self.delivered, self.rejected, self.no_email]
+		self.sent_emails = [
+			SentEmail.objects.create(
+				contracting_planning=self.planning,
+				contractor_email=contractor.email,
+				subject="Invitation: Kitchen Renovation Project",
+				body_html="<p>Hello</p>",
+			)
+			for contractor in self.contractors
+		]
+		# The delivered contractor was already greeted by an earlier invitation
+		Message.objects.create(
+			contracting_planning=self.planning,
+			contractor_id=self.delivered.id,
+			sender="ai",
+			content="Hello again!",
+		)
+
+	def run_task(self):
+		sends = [(sent_email.id, contractor.id) for sent_email, contractor in zip(self.sent_emails, self.contractors)]
+		return send_invitations_task(self.project.id, self.user.id, self.planning.id, sends, "", [])
+
+	@patch("core.tasks.send_invitations.GmailService.send_batch")
+	def test_rows_messages_and_step_after_sending(self, send_batch):
+		send_batch.return_value = [
+			{"message_id": "msg-1", "thread_id": "thread-1"},
+			{"error": "Mailbox unavailable"},
+		]
+
+		result = self.run_task()
+
+		self.assertEqual(
+			[message["to"] for message in send_batch.call_args.kwargs["messages"]],
+			["ok@example.com", "bounce@example.com"],
+		)
+		self.assertEqual((result["success"], result["failed"]), (1, 2))
+
+		delivered, rejected, no_email = [SentEmail.objects.get(id=row.id) for row in self.sent_emails]
+		self.assertEqual((delivered.status, delivered.gmail_message_id), ("sent", "msg-1"))
+		self.assertGreaterEqual(delivered.sent_at, rejected.sent_at)
+		self.assertEqual((rejected.status, rejected.error_message), ("failed", "Mailbox unavailable"))
+		self.assertEqual((no_email.status, no_email.error_message), ("failed", "No email address available"))
+
+		# No second welcome message for the contractor already greeted, none for failures
+		self.assertEqual(Message.objects.filter(contractor_id=self.delivered.id, sender="ai").count(), 1)
+		self.assertFalse(Message.objects.filter(contractor_id__in=[self.rejected.id, self.no_email.id]).exists())
+
+		self.planning.refresh_from_db()
+		self.assertEqual(self.planning.current_step, 4)
+
+	@patch("core.tasks.send_invitations.GmailService.send_batch")
+	@patch("core.tasks.send_invitations.GmailService.refresh_access_token")
+	def test_expired_token_is_refreshed_before_sending(self, refresh_access_token, send_batch):
+		EmailCredential.objects.filter(pk=self.credential.pk).update(
+			token_expiry=timezone.now() - timedelta(minutes=1), refresh_token="refresh"
+		)
+		refresh_access_token.return_value = {
+			"access_token": "fresh-token", "token_expiry": timezone.now() + timedelta(hours=1)
+		}
+		send_batch.return_value = [{"message_id": "msg-1", "thread_id": "thread-1"}, {"error": "Mailbox unavailable"}]
+
+		self.run_task()
+
+		refresh_access_token.assert_called_once_with("refresh")
+		self.assertEqual(send_batch.call_args.kwargs["access_token"], "fresh-token")
+
+	@patch("core.tasks.send_invitations._build_attachments", side_effect=RuntimeError("disk gone"))
+	def test_crash_leaves_no_pending_rows(self, build_attachments):
+		with self.assertRaises(RuntimeError):
+			self.run_task()
+
+		self.assertEqual(
+			set(SentEmail.objects.filter(id__in=[row.id for row in self.sent_emails]).values_list("status", flat=True)),
+			{"failed"},
+		)
+
+	@patch("core.api.contracting.send_invitations_view.fetch")
+	def test_result_view_hides_other_users_batches(self, fetch):
+		other = User.objects.create_user(username="someone-else", password="pw")
+		fetch.return_value = SimpleNamespace(
+			args=(self.project.id, other.id, self.planning.id, [], "", []),
+			success=True,
+			result={"success": 1, "failed": 0, "errors": [], "sent_emails": []},
+		)
+		self.client.force_login(self.user)
+
+		response = self.client.get(
+			reverse("contracting:contracting-planning-send-invitations-result", args=[self.project.id, "task-1"])
+		)
+
+		self.assertEqual(response.status_code, 404)
+
+	@patch("core.api.contracting.send_invitations_view.queued_task")
+	@patch("core.api.contracting.send_invitations_view.fetch", return_value=None)
+	def test_result_view_pending_only_while_queued(self, fetch, queued_task):
+		self.client.force_login(self.user)
+		url = reverse("contracting:contracting-planning-send-invitations-result", args=[self.project.id, "task-1"])
+
+		queued_task.return_value = {"id": "task-1", "args": (self.project.id, self.user.id, self.planning.id, [], "", [])}
+		self.assertEqual(self.client.get(url).status_code, 202)
+
+		# Never enqueued, or its result was pruned from the task table
+		queued_task.return_value = None
+		self.assertEqual(self.client.get(url).status_code, 404)
+
+	@patch("core.api.contracting.send_invitations_view.fetch")
+	def test_result_view_hides_task_errors(self, fetch):
+		fetch.return_value = SimpleNamespace(
+			args=(self.project.id, self.user.id, self.planning.id, [], "", []),
+			success=False,
+			result="Traceback (most recent call last): ...",
+		)
+		self.client.force_login(self.user)
+
+		response = self.client.get(
+			reverse("contracting:contracting-planning-send-invitations-result", args=[self.project.id, "task-1"])
+		)
+
+		self.assertEqual(response.status_code, 500)
+		self.assertNotIn("Traceback", response.content.decode())
+
+
+class PlanningAIStatusTest(TestCase):
+	def setUp(self):
+		self.user = User.objects.create_user(username="planner", password="pw")
+		self.project = Project.objects.create(
+			user=self.user, name="Roof", address="Main St 2", city="Munich",
+			postal_code="80331", state="Bavaria"
+		)
+		self.planning = ContractingPlanning.objects.create(project=self.project, ai_status="processing")
+		self.url = reverse("contracting:contracting-planning-detail", args=[self.project.id])
+		self.client.force_login(self.user)
+
+	def age_processing(self, minutes):
+		ContractingPlanning.objects.filter(pk=self.planning.pk).update(
+			updated_at=timezone.now() - timedelta(minutes=minutes)
+		)
+
+	@patch("core.api.contracting.contracting_planning_detail_view.async_task")
+	def test_running_job_is_not_enqueued_again(self, async_task):
+		response = self.client.get(self.url, {"regenerate_ai": "true"})
+
+		self.assertEqual(response.json()["ai_status"], "processing")
+		async_task.assert_not_called()
+
+	@patch("core.api.contracting.contracting_planning_detail_view.async_task")
+	def test_stale_job_reports_failed_and_can_be_regenerated(self, async_task):
+		self.age_processing(10)
+
+		self.assertEqual(self.client.get(self.url).json()["ai_status"], "failed")
+
+		response = self.client.get(self.url, {"regenerate_ai": "true"})
+
+		self.assertEqual(response.json()["ai_status"], "processing")
+		async_task.assert_called_once_with("core.tasks.planning_ai.process_planning_with_ai_task", self.planning.id)
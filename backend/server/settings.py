@@ -121,6 +121,10 @@ DATABASES = {
 	"default": {
 		"ENGINE": "django.db.backends.sqlite3",
 		"NAME": BASE_DIR / "db.sqlite3",
+		# Keep connections open between requests instead of reconnecting each time;
+		# health checks drop a stale connection before it is reused
+		"CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+		"CONN_HEALTH_CHECKS": True,
 	}
 }
 
@@ -184,6 +188,10 @@ REST_FRAMEWORK = {
 	"DEFAULT_PERMISSION_CLASSES": [
 		"rest_framework.permissions.IsAuthenticatedOrReadOnly",
 	],
+	"DEFAULT_RENDERER_CLASSES": [
+		"core.api.renderers.ORJSONRenderer",
+		"rest_framework.renderers.BrowsableAPIRenderer",
+	],
 	"EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
 	"FORMAT_SUFFIX_KWARG": "format",
 }
@@ -193,6 +201,11 @@ REST_FRAMEWORK = {
 # We unify them here so both names resolve to the same key.
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY") or GEMINI_API_KEY
 
+# Hedged Gemini requests: fire a duplicate call when the first one is slower than
+# the delay and keep whichever answers first. Off by default since it can double cost.
+GEMINI_HEDGED_REQUESTS = os.getenv("GEMINI_HEDGED_REQUESTS", "false").lower() == "true"
+GEMINI_HEDGE_DELAY_SECONDS = float(os.getenv("GEMINI_HEDGE_DELAY_SECONDS", "8"))
+
 # Gmail API Configuration for OAuth and Email Sending
 # Get these credentials from Google Cloud Console
 GMAIL_API_CLIENT_ID = os.getenv("GMAIL_API_CLIENT_ID", "")
@@ -211,10 +224,48 @@ GMAIL_OAUTH_SCOPES = ["https://www.googleapis.com/auth/gmail.send",
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Logging: handlers only enqueue records; a listener thread formats and writes
+# them so tracebacks and stream writes stay off the request path. Root stays at
+# WARNING like Python's default, and django keeps its mail_admins handler
+LOGGING = {
+	"version": 1,
+	"disable_existing_loggers": False,
+	"filters": {
+		"require_debug_false": {
+			"()": "django.utils.log.RequireDebugFalse",
+		},
+	},
+	"handlers": {
+		"queue": {
+			"class": "core.log_queue.DeferredQueueHandler",
+		},
+		"mail_admins": {
+			"level": "ERROR",
+			"filters": ["require_debug_false"],
+			"class": "django.utils.log.AdminEmailHandler",
+		},
+	},
+	"root": {
+		"handlers": ["queue"],
+		"level": os.getenv("LOG_LEVEL", "WARNING"),
+	},
+	"loggers": {
+		"django": {
+			"handlers": ["queue", "mail_admins"],
+			"level": "INFO",
+			"propagate": False,
+		},
+	},
+}
+
 # Django-Q Configuration for Background Tasks
+# The cluster (python manage.py qcluster) runs the email poll as well as the
+# user-facing jobs: chat plan generation, planning AI, PDF rendering and
+# invitation sends. Each of those can run up to 'timeout' seconds, so
+# several workers are needed to keep one user's job from holding up others.
 Q_CLUSTER = {
 	'name': 'RenovAlte',
-	'workers': 1,
+	'workers': int(os.getenv('Q_WORKERS', '4')),
 	'timeout': 300,
 	'retry': 360,
 	'queue_limit': 50,
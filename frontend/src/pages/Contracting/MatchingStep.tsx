@@ -24,6 +24,10 @@ const MatchingStep: React.FC<MatchingStepProps> = ({
 	const [loading, setLoading] = useState(false);
 	const [error, setError] = useState<string | null>(null);
 	const [visibleContractorsCount, setVisibleContractorsCount] = useState(3);
+	// Contractors are fetched a page at a time as "Load More" reaches the end
+	const [totalContractors, setTotalContractors] = useState(0);
+	const [nextPage, setNextPage] = useState<number | null>(null);
+	const [loadingMore, setLoadingMore] = useState(false);
 	
 	// Use ref to store callback to avoid re-render loops
 	const onContractorsLoadedRef = useRef(onContractorsLoaded);
@@ -43,7 +47,7 @@ const MatchingStep: React.FC<MatchingStepProps> = ({
 			setLoading(true);
 			setError(null);
 			try {
-				const data = await contractorApi.getAll(
+				const data = await contractorApi.getPage(
 					selectedProject.project_type,
 					selectedProject.city,
 					selectedProject.postal_code,
@@ -51,9 +55,11 @@ const MatchingStep: React.FC<MatchingStepProps> = ({
 				);
 				
 				if (isMounted) {
-					setContractors(data);
+					setContractors(data.results);
+					setTotalContractors(data.count);
+					setNextPage(data.next ? 2 : null);
 					if (onContractorsLoadedRef.current) {
-						onContractorsLoadedRef.current(data);
+						onContractorsLoadedRef.current(data.results);
 					}
 					setVisibleContractorsCount(3); // Reset pagination when loading new contractors
 				}
@@ -75,8 +81,32 @@ const MatchingStep: React.FC<MatchingStepProps> = ({
 		};
 	}, [selectedProject?.id, selectedProject?.project_type, selectedProject?.city, selectedProject?.postal_code, selectedProject?.state]);
 
-	const handleLoadMore = () => {
-		setVisibleContractorsCount((prev) => Math.min(prev + 3, contractors.length));
+	const handleLoadMore = async () => {
+		let loaded = contractors;
+		if (visibleContractorsCount + 3 > loaded.length && nextPage !== null) {
+			setLoadingMore(true);
+			try {
+				const data = await contractorApi.getPage(
+					selectedProject.project_type,
+					selectedProject.city,
+					selectedProject.postal_code,
+					selectedProject.state,
+					nextPage
+				);
+				loaded = [...loaded, ...data.results];
+				setContractors(loaded);
+				setNextPage(data.next ? nextPage + 1 : null);
+				if (onContractorsLoadedRef.current) {
+					onContractorsLoadedRef.current(loaded);
+				}
+			} catch (err) {
+				setError(err instanceof Error ? err.message : "Failed to load contractors");
+				return;
+			} finally {
+				setLoadingMore(false);
+			}
+		}
+		setVisibleContractorsCount((prev) => Math.min(prev + 3, loaded.length));
 	};
 
 	const selectedContractorsList = contractors.filter(
@@ -296,14 +326,19 @@ const MatchingStep: React.FC<MatchingStepProps> = ({
 							</div>
 
 							{/* Load More Button */}
-							{visibleContractorsCount < contractors.length && (
+							{(visibleContractorsCount < contractors.length || nextPage !== null) && (
 								<div className="flex justify-center mt-6">
 									<button
 										onClick={handleLoadMore}
-										className="flex items-center gap-2 bg-emerald-600 text-white px-6 py-3 rounded-lg font-medium hover:bg-emerald-700 transition-colors shadow-md hover:shadow-lg"
+										disabled={loadingMore}
+										className="flex items-center gap-2 bg-emerald-600 text-white px-6 py-3 rounded-lg font-medium hover:bg-emerald-700 transition-colors shadow-md hover:shadow-lg disabled:opacity-60"
 									>
-										<ChevronDown className="w-4 h-4 sm:w-5 sm:h-5" />
-										<span>Load More Contractors ({contractors.length - visibleContractorsCount} remaining)</span>
+										{loadingMore ? (
+											<Loader2 className="w-4 h-4 sm:w-5 sm:h-5 animate-spin" />
+										) : (
+											<ChevronDown className="w-4 h-4 sm:w-5 sm:h-5" />
+										)}
+										<span>Load More Contractors ({totalContractors - visibleContractorsCount} remaining)</span>
 									</button>
 								</div>
 							)}
@@ -99,6 +99,7 @@ export function ProjectSetupWizard({
   const [chatSessionId, setChatSessionId] = useState<number | null>(null);
   const [isChatLoading, setIsChatLoading] = useState(false);
   const [existingSessions, setExistingSessions] = useState<ChatSession[]>([]);
+  const [moreSessionsUrl, setMoreSessionsUrl] = useState<string | null>(null);
   const [showSessionPicker, setShowSessionPicker] = useState(false);
 
   // Get auth context
@@ -207,9 +208,10 @@ export function ProjectSetupWizard({
 
   const loadExistingSessions = async () => {
     try {
-      const sessions = await chatbotApi.getSessions(true);
-      setExistingSessions(sessions);
-      if (sessions.length > 0) {
+      const page = await chatbotApi.getSessions(true);
+      setExistingSessions(page.results);
+      setMoreSessionsUrl(page.next);
+      if (page.results.length > 0) {
         setShowSessionPicker(true);
       }
     } catch (error) {
@@ -217,6 +219,19 @@ export function ProjectSetupWizard({
     }
   };
 
+  const loadMoreSessions = async () => {
+    if (!moreSessionsUrl) {
+      return;
+    }
+    try {
+      const page = await chatbotApi.getSessions(true, moreSessionsUrl);
+      setExistingSessions((sessions) => [...sessions, ...page.results]);
+      setMoreSessionsUrl(page.next);
+    } catch (error) {
+      console.error("Failed to load sessions:", error);
+    }
+  };
+
   const continueSession = async (session: ChatSession) => {
     try {
       const fullSession = await chatbotApi.getSession(session.id);
@@ -943,7 +958,7 @@ export function ProjectSetupWizard({
               <div className="p-4 bg-blue-50 border border-blue-200 rounded-lg">
                 <h4 className="font-medium text-blue-800 mb-2">Continue a previous conversation?</h4>
                 <div className="space-y-2 max-h-40 overflow-y-auto">
-                  {existingSessions.slice(0, 5).map((session) => (
+                  {existingSessions.map((session) => (
                     <button
                       key={session.id}
                       onClick={() => continueSession(session)}
@@ -955,6 +970,14 @@ export function ProjectSetupWizard({
                       </div>
                     </button>
                   ))}
+                  {moreSessionsUrl && (
+                    <button
+                      onClick={loadMoreSessions}
+                      className="w-full text-sm text-blue-600 hover:text-blue-800"
+                    >
+                      Load older conversations
+                    </button>
+                  )}
                 </div>
                 <button
                   onClick={startNewSession}
@@ -1,4 +1,7 @@
 const API_BASE = "http://localhost:8000/api/chatbot";
+const PLAN_POLL_INTERVAL_MS = 2000;
+// Sessions fetched per page of the session picker
+const SESSION_PAGE_SIZE = 10;
 
 // Helper function to get CSRF token from cookies
 function getCSRFToken(): string | null {
@@ -32,6 +35,12 @@ export interface ChatSession {
   messages?: ChatMessageType[];
 }
 
+export interface ChatSessionPage {
+  results: ChatSession[];
+  // URL of the next (older) page, or null on the last one
+  next: string | null;
+}
+
 export interface ChatMessageType {
   id: number;
   role: "user" | "assistant" | "system";
@@ -103,13 +112,17 @@ export const chatbotApi = {
   },
 
   /**
-   * Get all chat sessions for current user
+   * Get one page of the current user's chat sessions, most recently active
+   * first. Pass the previous page's `next` URL to load older sessions.
    */
-  getSessions: async (activeOnly: boolean = true): Promise<ChatSession[]> => {
+  getSessions: async (
+    activeOnly: boolean = true,
+    next: string | null = null
+  ): Promise<ChatSessionPage> => {
     const csrfToken = getCSRFToken();
 
     const response = await fetch(
-      `${API_BASE}/sessions/?active_only=${activeOnly}`,
+      next ?? `${API_BASE}/sessions/?active_only=${activeOnly}&limit=${SESSION_PAGE_SIZE}`,
       {
         method: "GET",
         credentials: "include",
@@ -209,13 +222,40 @@ export const chatbotApi = {
       body: JSON.stringify({ session_id: sessionId }),
     });
 
-    const data = await response.json();
+    const queued = await response.json();
 
     if (!response.ok) {
-      throw new Error(data.error || "Failed to extract and generate plan");
+      throw new Error(queued.error || "Failed to extract and generate plan");
     }
 
-    return data;
+    // Plan generation runs in the background; poll until the task finishes
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, PLAN_POLL_INTERVAL_MS));
+
+      const statusResponse = await fetch(
+        `${API_BASE}/plans/status/${queued.task_id}/`,
+        {
+          method: "GET",
+          credentials: "include",
+          headers: {
+            "Content-Type": "application/json",
+            ...(csrfToken && { "X-CSRFToken": csrfToken }),
+          },
+        }
+      );
+
+      if (statusResponse.status === 202) {
+        continue;
+      }
+
+      const data = await statusResponse.json();
+
+      if (!statusResponse.ok) {
+        throw new Error(data.error || "Failed to extract and generate plan");
+      }
+
+      return data;
+    }
   },
 
   /**
@@ -38,6 +38,7 @@ export interface ContractingPlanningResponse {
   ai_summary?: string | null;
   ai_questions?: AIQuestion[] | null;
   user_answers?: UserAnswers | null;
+  ai_status?: "idle" | "processing" | "completed" | "failed";
   current_step: number;
   created_at: string;
   updated_at: string;
@@ -284,9 +285,24 @@ export interface OfferAnalysis {
   updated_at: string;
 }
 
+// List endpoint returns a light, paginated view of each offer; use getOffer for full details
+export type ContractorOfferListItem = Pick<
+  ContractorOffer,
+  | "id"
+  | "contractor_id"
+  | "contractor_name"
+  | "total_price"
+  | "currency"
+  | "timeline_start"
+  | "timeline_end"
+  | "created_at"
+>;
+
 export interface OfferListResponse {
-  offers: ContractorOffer[];
+  offers: ContractorOfferListItem[];
   total: number;
+  next: string | null;
+  previous: string | null;
 }
 
 export interface AnalyzeOfferResponse {
@@ -340,6 +356,37 @@ const ensureCsrfToken = async (): Promise<string> => {
   return token || (await fetchCsrfToken());
 };
 
+const AI_POLL_INTERVAL_MS = 2000;
+// The backend reports a job still processing after its 5-minute task timeout
+// as failed; stop waiting a little after that
+const AI_POLL_TIMEOUT_MS = 6 * 60 * 1000;
+const PDF_POLL_INTERVAL_MS = 1000;
+const INVITATION_POLL_INTERVAL_MS = 1000;
+// Sending is bounded by the same 5-minute task timeout
+const INVITATION_POLL_TIMEOUT_MS = 6 * 60 * 1000;
+
+/**
+ * Poll the planning until its AI job leaves "processing"
+ */
+const waitForAiProcessing = async (
+  projectId: number,
+  planning: ContractingPlanningResponse
+): Promise<ContractingPlanningResponse> => {
+  const deadline = Date.now() + AI_POLL_TIMEOUT_MS;
+  while (planning.ai_status === "processing") {
+    if (Date.now() > deadline) {
+      throw new Error("AI processing is taking too long, please try again");
+    }
+    await new Promise((resolve) => setTimeout(resolve, AI_POLL_INTERVAL_MS));
+    const latest = await contractingPlanningApi.getRequirements(projectId);
+    if (!latest) {
+      break;
+    }
+    planning = latest;
+  }
+  return planning;
+};
+
 export const contractingPlanningApi = {
   /**
    * Submit contracting planning requirements with optional file uploads
@@ -402,7 +449,9 @@ export const contractingPlanningApi = {
       throw new Error(message);
     }
 
-    return response.json();
+    // AI summary and questions are generated in the background; poll until ready
+    const planning: ContractingPlanningResponse = await response.json();
+    return waitForAiProcessing(request.project_id, planning);
   },
 
   /**
@@ -464,7 +513,9 @@ export const contractingPlanningApi = {
       throw new Error(message);
     }
 
-    return response.json();
+    // AI post-processing runs in the background; poll until ready
+    const planning: ContractingPlanningResponse = await response.json();
+    return waitForAiProcessing(projectId, planning);
   },
 
   /**
@@ -562,18 +613,44 @@ export const contractingPlanningApi = {
       }
     );
 
-    if (!response.ok) {
-      let message = `HTTP error! status: ${response.status}`;
+    const readError = async (res: Response): Promise<Error> => {
+      let message = `HTTP error! status: ${res.status}`;
       try {
-        const data = await response.json();
+        const data = await res.json();
         message = data.detail || data.message || message;
       } catch {
         // Keep default message
       }
-      throw new Error(message);
+      return new Error(message);
+    };
+
+    if (!response.ok) {
+      throw await readError(response);
     }
 
-    return response.blob();
+    // The PDF is rendered in the background; poll until the file is ready
+    const { task_id } = await response.json();
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, PDF_POLL_INTERVAL_MS));
+
+      const result = await fetch(
+        `${API_BASE_URL}/contracting/planning/${projectId}/pdf/${task_id}/`,
+        {
+          method: "GET",
+          credentials: "include",
+        }
+      );
+
+      if (result.status === 202) {
+        continue;
+      }
+
+      if (!result.ok) {
+        throw await readError(result);
+      }
+
+      return result.blob();
+    }
   },
 
   /**
@@ -661,18 +738,48 @@ export const contractingPlanningApi = {
       }
     );
 
-    if (!response.ok) {
-      let message = `HTTP error! status: ${response.status}`;
+    const readError = async (res: Response): Promise<Error> => {
+      let message = `HTTP error! status: ${res.status}`;
       try {
-        const data = await response.json();
+        const data = await res.json();
         message = data.detail || data.message || message;
       } catch {
         // Keep default message
       }
-      throw new Error(message);
+      return new Error(message);
+    };
+
+    if (!response.ok) {
+      throw await readError(response);
     }
 
-    return response.json();
+    // Emails are sent in the background; poll until every contractor is done
+    const { task_id } = await response.json();
+    const deadline = Date.now() + INVITATION_POLL_TIMEOUT_MS;
+    while (true) {
+      if (Date.now() > deadline) {
+        throw new Error("Sending invitations is taking too long, please check the sent emails later");
+      }
+      await new Promise((resolve) => setTimeout(resolve, INVITATION_POLL_INTERVAL_MS));
+
+      const result = await fetch(
+        `${API_BASE_URL}/contracting/planning/${projectId}/invitation/send/${task_id}/`,
+        {
+          method: "GET",
+          credentials: "include",
+        }
+      );
+
+      if (result.status === 202) {
+        continue;
+      }
+
+      if (!result.ok) {
+        throw await readError(result);
+      }
+
+      return result.json();
+    }
   },
 
   /**
@@ -26,13 +26,24 @@ export interface Contractor {
 	project_types: string;
 }
 
+export interface PaginatedContractors {
+	count: number;
+	next: string | null;
+	previous: string | null;
+	results: Contractor[];
+}
+
 export const contractorApi = {
-	async getAll(
+	/**
+	 * One page of matching contractors, best-rated first (50 per page)
+	 */
+	async getPage(
 		projectType: string,
 		city?: string,
 		postal_code?: string,
-		state?: string
-	): Promise<Contractor[]> {
+		state?: string,
+		page: number = 1
+	): Promise<PaginatedContractors> {
 		const params = new URLSearchParams();
 		params.append("project_type", projectType);
 		if (city) {
@@ -45,7 +56,9 @@ export const contractorApi = {
 			params.append("state", state);
 		}
 
-		return apiRequest<Contractor[]>(`/contracting/contractors/?${params.toString()}`);
+		params.append("page", String(page));
+
+		return apiRequest<PaginatedContractors>(`/contracting/contractors/?${params.toString()}`);
 	},
 };
 